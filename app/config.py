@@ -4,11 +4,94 @@ This module defines the Settings dataclass that loads configuration
 from environment variables.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
+import functools
 import os
+import sys
 
+__all__ = ["Settings"]
 
-@dataclass
+_ENV_GET = os.environ.get
+
+_TRUE = frozenset(("1", "true", "t", "yes", "y"))
+_FALSE = frozenset(("0", "false", "f", "no", "n", ""))
+
+
+def _get_bool(value: str | None, default: bool = False) -> bool:
+    """Convert string value to boolean.
+
+    Args:
+        value: String value to convert.
+        default: Default value if value is None or not a recognised
+            boolean string.
+
+    Returns:
+        Boolean value.
+    """
+    if value is None:
+        return default
+    v = value.lower()
+    if v in _TRUE:
+        return True
+    if v in _FALSE:
+        return False
+    return default
+
+
+def _parse(var: str, default: str | None, conv):
+    """Read one environment variable and convert it.
+
+    Args:
+        var: Environment variable name.
+        default: Raw string used when the variable is unset.
+        conv: Converter for the raw string, or None to keep it as is.
+
+    Returns:
+        Converted value.
+
+    Raises:
+        ValueError: If the value cannot be converted; the message names
+            the environment variable.
+    """
+    raw = _ENV_GET(var, default)
+    if conv is None:
+        return raw
+    try:
+        return conv(raw)
+    except ValueError as e:
+        msg = f"Invalid value for {var}: {raw!r}"
+        raise ValueError(msg) from e
+
+
+def _env(var: str, default: str | None = None):
+    """Declare a settings field backed by an environment variable.
+
+    Args:
+        var: Environment variable name.
+        default: Raw string used when the variable is unset.
+
+    Returns:
+        Dataclass field carrying the variable name and default as metadata.
+    """
+    if default is not None:
+        # Interned so every instance shares one object per default string.
+        default = sys.intern(default)
+    return field(metadata={"env": var, "default": default})
+
+
+def _derived(compute):
+    """Declare a settings value computed from other fields on first access.
+
+    Args:
+        compute: Callable taking the Settings instance and returning the value.
+
+    Returns:
+        Dataclass field excluded from ``__init__``, repr and comparisons.
+    """
+    return field(init=False, repr=False, compare=False, metadata={"derive": compute})
+
+
+@dataclass(slots=True, frozen=True)
 class Settings:
     """Application settings loaded from environment variables.
 
@@ -36,88 +119,113 @@ class Settings:
         top_k: Number of top results to retrieve.
         temperature: Generation temperature.
         embedding_dim: Embedding dimension.
+        watsonx_url: Watsonx.ai endpoint URL derived from watsonx_region.
     """
 
-    ibm_cloud_api_key: str
-    watsonx_region: str
-    watsonx_project_id: str
-    watsonx_embed_model: str
-    watsonx_gen_model: str
-
-    cos_endpoint: str
-    cos_bucket: str
-    cos_instance_crn: str
-    cos_api_key: str | None
-    cos_auth_endpoint: str
-    cos_hmac_access_key_id: str
-    cos_hmac_secret_access_key: str
-
-    milvus_host: str
-    milvus_port: int
-    milvus_db: str | None
-    milvus_tls: bool
-
-    faiss_index_path: str
-    faiss_meta_path: str
-
-    chunk_size: int
-    chunk_overlap: int
-    top_k: int
-    temperature: float
-    embedding_dim: int
-
-    @staticmethod
-    def _get_bool(value: str | None, default: bool = False) -> bool:
-        """Convert string value to boolean.
+    ibm_cloud_api_key: str = _env("IBM_CLOUD_API_KEY", "")
+    watsonx_region: str = _env("WATSONX_REGION", "us-south")
+    watsonx_project_id: str = _env("WATSONX_PROJECT_ID", "")
+    watsonx_embed_model: str = _env(
+        "WATSONX_EMBED_MODEL", "ibm/granite-embedding-30m-english"
+    )
+    watsonx_gen_model: str = _env("WATSONX_GEN_MODEL", "ibm/granite-13b-instruct-v2")
+
+    cos_endpoint: str = _env("COS_ENDPOINT", "")
+    cos_bucket: str = _env("COS_BUCKET", "")
+    cos_instance_crn: str = _env("COS_INSTANCE_CRN", "")
+    cos_api_key: str | None = _env("COS_API_KEY")
+    cos_auth_endpoint: str = _env(
+        "COS_AUTH_ENDPOINT", "https://iam.cloud.ibm.com/identity/token"
+    )
+    cos_hmac_access_key_id: str = _env("COS_HMAC_ACCESS_KEY_ID", "")
+    cos_hmac_secret_access_key: str = _env("COS_HMAC_SECRET_ACCESS_KEY", "")
+
+    milvus_host: str = _env("MILVUS_HOST", "localhost")
+    milvus_port: int = _env("MILVUS_PORT", "19530")
+    milvus_db: str | None = _env("MILVUS_DB")
+    milvus_tls: bool = _env("MILVUS_TLS")
+
+    faiss_index_path: str = _env("FAISS_INDEX_PATH", "data/index.faiss")
+    faiss_meta_path: str = _env("FAISS_META_PATH", "data/meta.json")
+
+    chunk_size: int = _env("CHUNK_SIZE", "1200")
+    chunk_overlap: int = _env("CHUNK_OVERLAP", "150")
+    top_k: int = _env("TOP_K", "6")
+    temperature: float = _env("TEMPERATURE", "0.2")
+    embedding_dim: int = _env("EMBEDDING_DIM", "1024")
+
+    watsonx_url: str = _derived(
+        lambda s: f"https://{s.watsonx_region}.ml.cloud.ibm.com"
+    )
+
+    def __getattr__(self, name: str):
+        """Load a field from the environment on first access.
+
+        Only called for slots that have not been assigned yet, i.e. string
+        fields of an instance created by ``from_env`` that have not been
+        read, and derived values that have not been computed. The value is
+        stored in the slot, so later reads bypass this.
 
         Args:
-            value: String value to convert.
-            default: Default value if value is None.
+            name: Attribute name being looked up.
 
         Returns:
-            Boolean value.
+            Parsed field value.
+
+        Raises:
+            AttributeError: If ``name`` is not a settings field.
         """
-        if value is None:
-            return default
-        return value.lower() in {"1", "true", "t", "yes", "y"}
+        entry = _FIELDS_BY_NAME.get(name)
+        if entry is not None:
+            value = _parse(*entry)
+            if name == "cos_api_key":
+                # Reuse the (memoized) IBM Cloud key instead of re-reading it.
+                value = value or self.ibm_cloud_api_key or None
+        elif name in _DERIVED:
+            value = _DERIVED[name](self)
+        else:
+            raise AttributeError(name)
+        object.__setattr__(self, name, value)
+        return value
 
     @classmethod
+    @functools.lru_cache(maxsize=1)
     def from_env(cls) -> "Settings":
         """Create Settings instance from environment variables.
 
+        Numeric and boolean fields are parsed here in one pass, so a
+        malformed value such as ``TOP_K=abc`` fails at startup instead of
+        in the middle of a request. String fields need no validation and
+        are read lazily on first access. The instance is cached for the
+        lifetime of the process, since the environment does not change
+        after startup. Use ``reset_cache`` to force a reload.
+
         Returns:
             Settings instance with values loaded from environment.
+
+        Raises:
+            ValueError: If a numeric or boolean variable cannot be parsed.
         """
-        return cls(
-            ibm_cloud_api_key=os.getenv("IBM_CLOUD_API_KEY", ""),
-            watsonx_region=os.getenv("WATSONX_REGION", "us-south"),
-            watsonx_project_id=os.getenv("WATSONX_PROJECT_ID", ""),
-            watsonx_embed_model=os.getenv(
-                "WATSONX_EMBED_MODEL",
-                "ibm/granite-embedding-30m-english",
-            ),
-            watsonx_gen_model=os.getenv(
-                "WATSONX_GEN_MODEL", "ibm/granite-13b-instruct-v2"
-            ),
-            cos_endpoint=os.getenv("COS_ENDPOINT", ""),
-            cos_bucket=os.getenv("COS_BUCKET", ""),
-            cos_instance_crn=os.getenv("COS_INSTANCE_CRN", ""),
-            cos_api_key=os.getenv("COS_API_KEY") or os.getenv("IBM_CLOUD_API_KEY"),
-            cos_auth_endpoint=os.getenv(
-                "COS_AUTH_ENDPOINT",
-                "https://iam.cloud.ibm.com/identity/token",
-            ),
-            cos_hmac_access_key_id=os.getenv("COS_HMAC_ACCESS_KEY_ID", ""),
-            cos_hmac_secret_access_key=os.getenv("COS_HMAC_SECRET_ACCESS_KEY", ""),
-            milvus_host=os.getenv("MILVUS_HOST", "localhost"),
-            milvus_port=int(os.getenv("MILVUS_PORT", "19530")),
-            milvus_db=os.getenv("MILVUS_DB"),
-            milvus_tls=cls._get_bool(os.getenv("MILVUS_TLS"), False),
-            faiss_index_path=os.getenv("FAISS_INDEX_PATH", "data/index.faiss"),
-            faiss_meta_path=os.getenv("FAISS_META_PATH", "data/meta.json"),
-            chunk_size=int(os.getenv("CHUNK_SIZE", "1200")),
-            chunk_overlap=int(os.getenv("CHUNK_OVERLAP", "150")),
-            top_k=int(os.getenv("TOP_K", "6")),
-            temperature=float(os.getenv("TEMPERATURE", "0.2")),
-            embedding_dim=int(os.getenv("EMBEDDING_DIM", "1024")),
-        )
+        settings = object.__new__(cls)
+        for name, (var, default, conv) in _FIELDS_BY_NAME.items():
+            if conv is not None:
+                object.__setattr__(settings, name, _parse(var, default, conv))
+        return settings
+
+    @classmethod
+    def reset_cache(cls) -> None:
+        """Clear the cached instance so the next ``from_env`` re-reads the environment."""
+        cls.from_env.cache_clear()
+
+
+# Coercion schema derived once from the Settings annotations. Fields typed
+# str or str | None have no converter and keep the raw environment value.
+_CONVERTERS = {int: int, float: float, bool: _get_bool}
+_FIELDS_BY_NAME = {
+    f.name: (f.metadata["env"], f.metadata["default"], _CONVERTERS.get(f.type))
+    for f in fields(Settings)
+    if "env" in f.metadata
+}
+_DERIVED = {
+    f.name: f.metadata["derive"] for f in fields(Settings) if "derive" in f.metadata
+}
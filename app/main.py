@@ -4,1081 +4,198 @@ This module provides the user interface for the MedCortex application,
 including document upload, query processing, and report generation.
 """
 
-from datetime import datetime
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+from datetime import UTC, datetime
+import functools
 import hashlib
+import html
+from importlib.util import find_spec
+import io
+from pathlib import Path
 import re
-import uuid
+import secrets
+import time
+from typing import TYPE_CHECKING, Final
 
 from dotenv import load_dotenv
 import streamlit as st
 
 from app.config import Settings
-from app.rag.pipeline import IngestionPipeline, QueryPipeline
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from app.rag.pipeline import IngestionPipeline, PreparedDocument, QueryPipeline
+
+# Readable stylesheet shipped alongside this module, minified once at import.
+_CSS_PATH = Path(__file__).with_name("static") / "medcortex.css"
+_CSS_SOURCE = _CSS_PATH.read_text(encoding="utf-8")
+
+# Quoted strings are matched first in both patterns so they pass through
+# untouched.
+_CSS_COMMENT_RE = re.compile(r'("(?:\\.|[^"\\])*")|/\*.*?\*/', re.S)
+_CSS_WHITESPACE_RE = re.compile(
+    r'("(?:\\.|[^"\\])*")'
+    r"|\s*([{};,>])\s*"  # whitespace around punctuation, dropped
+    r"|([:(])\s+"  # whitespace after a colon or opening paren, dropped
+    r"|(\s+(?=\)))"  # whitespace before a closing paren, dropped
+    r"|\s+"  # any other run of whitespace, collapsed
+)
+_CSS_EMPTY_RULE_RE = re.compile(r"(?<=[{}])[^{}]+\{\}")
+_CSS_DECLARATIONS_RE = re.compile(r"\{[^{}]*\}")
+_CSS_VALUE_RE = re.compile(
+    r'("(?:\\.|[^"\\])*")'
+    r"|#([0-9a-fA-F])\2([0-9a-fA-F])\3([0-9a-fA-F])\4\b"  # #aabbcc -> #abc
+    r"|(?<![\w.])0+(\.\d)"  # 0.5 -> .5
+)
+
+
+def _shorten_css_value(m: re.Match) -> str:
+    """Shorten one hex color or leading-zero number matched by _CSS_VALUE_RE.
+
+    Args:
+        m: Match of _CSS_VALUE_RE inside a declaration block.
+
+    Returns:
+        Shortest equivalent spelling; quoted strings are returned unchanged.
+    """
+    if m.group(1):
+        return m.group(1)
+    if m.group(2):
+        return f"#{m.group(2)}{m.group(3)}{m.group(4)}"
+    return m.group(5)
+
+
+def _minify_css(css: str) -> str:
+    """Strip comments, redundant whitespace and empty rules from CSS.
+
+    Args:
+        css: Stylesheet source.
+
+    Returns:
+        Minified stylesheet.
+    """
+
+    css = _CSS_COMMENT_RE.sub(lambda m: m.group(1) or "", css)
+    css = _CSS_WHITESPACE_RE.sub(
+        lambda m: m.group(1) or m.group(2) or m.group(3) or ("" if m.group(4) else " "),
+        css,
+    )
+    css = css.replace(";}", "}")
+    css = _CSS_DECLARATIONS_RE.sub(
+        lambda m: _CSS_VALUE_RE.sub(_shorten_css_value, m.group()), css
+    )
+    return _CSS_EMPTY_RULE_RE.sub("", css).strip()
+
+
+# Complete <style> block injected by inject_custom_css(); importable as app.main.CSS.
+CSS: Final[str] = f"<style>{_minify_css(_CSS_SOURCE)}</style>"
+
+# Accuracy disclaimer shown under the Research Assistant title.
+_DISCLAIMER_HTML: Final[str] = (
+    '<p style="font-size: 0.85rem; color: var(--secondary-text); opacity: 0.6; margin-top: -0.8rem; margin-bottom: 1rem;">'
+    "While MedCortex strives for accuracy through verification and source attribution, "
+    "AI-generated content may contain errors. Please review all information and verify "
+    "critical findings against original sources."
+    "</p>"
+)
+
+# Streamed answers are redrawn at most once per interval, and only once at
+# least this many new characters have arrived.
+_STREAM_FLUSH_INTERVAL = 0.05  # seconds
+_STREAM_FLUSH_CHARS = 8
+
+# Number of chat messages rendered at once (and added per "Load earlier").
+_CHAT_WINDOW = 50
+
+# Number of fetched document bodies kept per session for repeat downloads.
+_COS_BODY_CACHE_SIZE = 16
+
+# Agent trajectory steps rendered as collapsible expanders.
+_TRAJECTORY_STEP_TYPES = frozenset(
+    {
+        "planning",
+        "decomposition",
+        "retrieval",
+        "intermediate_answer",
+        "synthesis",
+        "verification",
+        "verification_result",
+    }
+)
+
+# Marker separating an answer from its references section.
+_REFS_SENTINEL = "**References:**"
+
+# Patterns used when parsing answers, references and the report.
+_S3_URI_RE = re.compile(r"s3://\S+")
+_AUTHOR_AND_RE = re.compile(r"\s+and\s+", re.IGNORECASE)
+_NUMBERED_ITEM_RE = re.compile(r"^\d+\.")
+_SENTENCE_SPLIT_RE = re.compile(r"([.;]\s+|\n+)")
 
 
-@st.cache_resource
 def get_css_content() -> str:
     """Return CSS content for MedCortex UI styling.
 
     Returns:
-        CSS content as a string. Cached to avoid re-injecting on every rerun.
+        Complete <style> block, minified and wrapped once at import.
     """
-    return r"""
-        <style>
-        /* MedCortex Color Palette */
-        
-        /* Light Mode Colors */
-        :root {
-            --background: #FFFFFF;
-            --ui-panel: #F0F2F6;
-            --primary-text: #121212;
-            --secondary-text: #525252;
-            --verification-green: #22C55E;
-            --warning-orange: #F97316;
-            --user-error-red: #EF4444;
-            --info-blue: #3B82F6;
-        }
-        
-        /* Dark Mode Colors */
-        @media (prefers-color-scheme: dark) {
-            :root {
-                --background: #121212;
-                --ui-panel: #2b2b2b;
-                --primary-text: #FFFFFF;
-                --secondary-text: #AAAAAA;
-                --verification-green: #22C55E;
-                --warning-orange: #F97316;
-                --user-error-red: #EF4444;
-                --info-blue: #3B82F6;
-            }
-        }
-        
-        /* Override Streamlit default styles */
-        .stApp {
-            background-color: var(--background);
-        }
-        
-        /* Main container */
-        .main .block-container {
-            background-color: var(--background);
-            padding-top: 2rem;
-            padding-bottom: 2rem;
-        }
-        
-        /* Title styling - MedCortex branding */
-        h1 {
-            color: var(--primary-text) !important;
-            font-weight: 700;
-            font-size: 2.5rem;
-            letter-spacing: -0.02em;
-        }
-        
-        /* MedCortex logo/title accent - removed icon for professional look */
-        
-        /* Caption/subtitle */
-        .stMarkdown p {
-            color: var(--primary-text);
-        }
-        
-        /* Sidebar */
-        .css-1d391kg {
-            background-color: var(--ui-panel);
-        }
-        
-        [data-testid="stSidebar"] {
-            background-color: var(--ui-panel);
-        }
-        
-        /* Sidebar title - MedCortex */
-        [data-testid="stSidebar"] h1 {
-            color: var(--primary-text) !important;
-            font-weight: 700;
-            font-size: 1.75rem;
-            letter-spacing: -0.01em;
-            margin-bottom: 0.5rem !important;
-        }
-        
-        [data-testid="stSidebar"] .stMarkdown h2,
-        [data-testid="stSidebar"] .stMarkdown h3 {
-            color: var(--primary-text) !important;
-        }
-        
-        [data-testid="stSidebar"] .stMarkdown,
-        [data-testid="stSidebar"] p {
-            color: var(--secondary-text) !important;
-        }
-        
-        /* Sidebar dividers */
-        [data-testid="stSidebar"] hr {
-            border-color: var(--secondary-text) !important;
-            opacity: 0.3 !important;
-            margin: 1rem 0 !important;
-        }
-        
-        /* Sidebar document items */
-        [data-testid="stSidebar"] .stMarkdown strong {
-            color: var(--primary-text) !important;
-            font-weight: 600;
-        }
-        
-        [data-testid="stSidebar"] .stMarkdown .stCaption {
-            color: var(--secondary-text) !important;
-            font-size: 0.875rem;
-        }
-        
-        /* Sidebar info box */
-        [data-testid="stSidebar"] .stInfo {
-            background-color: rgba(59, 130, 246, 0.1) !important;
-            border-left: 3px solid var(--info-blue) !important;
-        }
-        
-        /* User chat message - User/Error Red */
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="user"]) [data-testid="stChatMessageContent"] {
-            background-color: var(--user-error-red);
-            color: #ffffff;
-            border-radius: 12px 12px 0 12px;
-            padding: 12px 16px;
-        }
-        
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="user"]) [data-testid="stChatMessageContent"] p {
-            color: #ffffff !important;
-        }
-        
-        /* Assistant chat message - UI Panel */
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] {
-            background-color: var(--ui-panel);
-            color: var(--primary-text) !important;
-            border-radius: 12px 12px 12px 0;
-            padding: 12px 16px;
-        }
-        
-        /* Ensure all text in assistant messages is primary text - comprehensive selector */
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] * {
-            color: var(--primary-text) !important;
-        }
-        
-        /* Override markdown text colors within assistant messages */
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] .stMarkdown,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] .stMarkdown *,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] p,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] div,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] span,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] li,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] ul,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] ol,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] h1,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] h2,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] h3,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] h4,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] h5,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] h6,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] code,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] pre,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] blockquote,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] em,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] i,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] small {
-            color: var(--primary-text) !important;
-        }
-        
-        /* Bold/strong text in assistant messages */
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] strong,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] b {
-            color: var(--primary-text) !important;
-        }
-        
-        /* Links in assistant messages */
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] a {
-            color: var(--primary-text) !important;
-            text-decoration: underline !important;
-        }
-        
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] a:hover {
-            color: var(--primary-text) !important;
-            opacity: 0.9 !important;
-        }
-        
-        /* ============ CURSOR-STYLE BUTTONS ============ */
-        /* Base Cursor-style button - applies to all buttons by default */
-        .stButton > button,
-        [data-testid="stButton"] > button,
-        .stDownloadButton > button,
-        button[data-testid="baseButton-secondary"],
-        button[data-testid="baseButton-primary"] {
-            /* Cursor-style base appearance */
-            background-color: var(--ui-panel) !important;
-            color: var(--primary-text) !important;
-            border: 1px solid rgba(82, 82, 82, 0.3) !important;
-            border-radius: 6px !important;
-            padding: 0.375rem 0.75rem !important;
-            font-size: 0.8125rem !important;
-            font-weight: 400 !important;
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif !important;
-            cursor: pointer !important;
-            transition: all 0.15s ease !important;
-            box-shadow: none !important;
-            outline: none !important;
-            min-height: auto !important;
-            height: auto !important;
-            white-space: nowrap !important;
-        }
-        
-        /* Hover state */
-        .stButton > button:hover,
-        [data-testid="stButton"] > button:hover,
-        .stDownloadButton > button:hover,
-        button[data-testid="baseButton-secondary"]:hover,
-        button[data-testid="baseButton-primary"]:hover {
-            background-color: var(--ui-panel) !important;
-            opacity: 0.9 !important;
-            border-color: var(--secondary-text) !important;
-        }
-        
-        /* Active/pressed state - no special styling */
-        .stButton > button:active,
-        [data-testid="stButton"] > button:active,
-        .stDownloadButton > button:active,
-        button[data-testid="baseButton-secondary"]:active,
-        button[data-testid="baseButton-primary"]:active {
-            /* No active styles - keep same as default */
-        }
-        
-        /* Focus state - no special styling */
-        .stButton > button:focus,
-        [data-testid="stButton"] > button:focus,
-        .stDownloadButton > button:focus,
-        button[data-testid="baseButton-secondary"]:focus,
-        button[data-testid="baseButton-primary"]:focus,
-        .stButton > button:focus-visible,
-        [data-testid="stButton"] > button:focus-visible,
-        .stDownloadButton > button:focus-visible,
-        button[data-testid="baseButton-secondary"]:focus-visible,
-        button[data-testid="baseButton-primary"]:focus-visible {
-            /* No focus styles - keep same as default */
-            outline: none !important;
-        }
-        
-        /* Disabled state */
-        .stButton > button:disabled,
-        [data-testid="stButton"] > button:disabled,
-        .stDownloadButton > button:disabled,
-        button[data-testid="baseButton-secondary"]:disabled,
-        button[data-testid="baseButton-primary"]:disabled {
-            opacity: 0.5 !important;
-            cursor: not-allowed !important;
-        }
-        
-        /* Dark mode support */
-        @media (prefers-color-scheme: dark) {
-            .stButton > button,
-            [data-testid="stButton"] > button,
-            .stDownloadButton > button,
-            button[data-testid="baseButton-secondary"],
-            button[data-testid="baseButton-primary"] {
-                background-color: var(--ui-panel) !important;
-                color: var(--primary-text) !important;
-                border-color: rgba(170, 170, 170, 0.3) !important;
-            }
-            
-            .stButton > button:hover,
-            [data-testid="stButton"] > button:hover,
-            .stDownloadButton > button:hover,
-            button[data-testid="baseButton-secondary"]:hover,
-            button[data-testid="baseButton-primary"]:hover {
-                background-color: var(--ui-panel) !important;
-                opacity: 0.9 !important;
-                border-color: var(--secondary-text) !important;
-            }
-            
-            .stButton > button:active,
-            [data-testid="stButton"] > button:active,
-            .stDownloadButton > button:active,
-            button[data-testid="baseButton-secondary"]:active,
-            button[data-testid="baseButton-primary"]:active {
-                /* No active styles - keep same as default */
-            }
-        }
-        
-        /* Context-specific button styles - different styles for different locations */
-        
-        /* Main content buttons */
-        .main .stButton > button {
-            padding: 0.5rem 1rem !important;
-            font-size: 0.875rem !important;
-        }
-        
-        /* Chat area buttons (Add to Report) - smaller */
-        [data-testid="stChatMessage"] ~ .stButton > button,
-        .main [data-testid="stChatMessage"] ~ .stButton > button {
-            padding: 0.375rem 0.75rem !important;
-            font-size: 0.75rem !important;
-        }
-        
-        /* Download buttons - same as base */
-        .stDownloadButton > button {
-            /* Uses base Cursor style */
-        }
-        
-        /* ============ NAVIGATION SECTION (Sidebar) ============ */
-        /* Reduce spacing after Navigation heading */
-        [data-testid="stSidebar"] h3,
-        [data-testid="stSidebar"] .stMarkdown h3 {
-            margin-bottom: 1rem !important;
-            margin-top: 0 !important;
-            padding-bottom: 0 !important;
-            padding-top: 0 !important;
-            line-height: 1.2 !important;
-        }
-        
-        /* Reduce spacing between Navigation heading and buttons */
-        [data-testid="stSidebar"] [data-testid="stVerticalBlock"]:has(h3) + [data-testid="stVerticalBlock"],
-        [data-testid="stSidebar"] .stMarkdown:has(h3) ~ [data-testid="stVerticalBlock"] {
-            margin-top: 0.1rem !important;
-            padding-top: 0 !important;
-        }
-        
-        /* Reduce spacing on button containers that follow Navigation heading */
-        [data-testid="stSidebar"] [data-testid="stVerticalBlock"]:has(h3) ~ [data-testid="stVerticalBlock"] .stButton,
-        [data-testid="stSidebar"] [data-testid="stVerticalBlock"]:has(h3) + [data-testid="stVerticalBlock"] .stButton {
-            margin-top: 0 !important;
-            padding-top: 0 !important;
-            margin-bottom: 0.25rem !important;
-        }
-        
-        /* Target the first button after Navigation more directly */
-        [data-testid="stSidebar"] h3 ~ [data-testid="stVerticalBlock"] .stButton,
-        [data-testid="stSidebar"] h3 + [data-testid="stVerticalBlock"] .stButton,
-        [data-testid="stSidebar"] .stMarkdown:has(h3) + [data-testid="stVerticalBlock"] .stButton {
-            margin-top: 0 !important;
-            padding-top: 0 !important;
-        }
-        
-        /* Navigation buttons in sidebar */
-        [data-testid="stSidebar"] .stButton > button,
-        [data-testid="stSidebar"] button[data-testid="baseButton-secondary"] {
-            background-color: var(--ui-panel) !important;
-            color: var(--primary-text) !important;
-            border: 1px solid rgba(82, 82, 82, 0.3) !important;
-            font-weight: 500 !important;
-        }
-        
-        /* Ensure button text elements use primary color */
-        [data-testid="stSidebar"] .stButton > button *,
-        [data-testid="stSidebar"] button[data-testid="baseButton-secondary"] *,
-        [data-testid="stSidebar"] .stButton > button span,
-        [data-testid="stSidebar"] button[data-testid="baseButton-secondary"] span,
-        [data-testid="stSidebar"] .stButton > button p,
-        [data-testid="stSidebar"] button[data-testid="baseButton-secondary"] p {
-            color: var(--primary-text) !important;
-        }
-        
-        
-        [data-testid="stSidebar"] .stButton > button:hover,
-        [data-testid="stSidebar"] button[data-testid="baseButton-secondary"]:hover {
-            background-color: var(--ui-panel) !important;
-            opacity: 0.9 !important;
-            border-color: var(--secondary-text) !important;
-            color: var(--primary-text) !important;
-        }
-        
-        [data-testid="stSidebar"] .stButton > button:hover *,
-        [data-testid="stSidebar"] button[data-testid="baseButton-secondary"]:hover * {
-            color: var(--primary-text) !important;
-        }
-        
-        [data-testid="stSidebar"] .stButton > button:disabled,
-        [data-testid="stSidebar"] button[data-testid="baseButton-secondary"]:disabled {
-            background-color: var(--ui-panel) !important;
-            opacity: 0.5 !important;
-            color: var(--secondary-text) !important;
-            border-color: rgba(82, 82, 82, 0.2) !important;
-        }
-        
-        [data-testid="stSidebar"] .stButton > button:disabled *,
-        [data-testid="stSidebar"] button[data-testid="baseButton-secondary"]:disabled * {
-            color: var(--secondary-text) !important;
-        }
-        
-        /* Headers with dividers - compact */
-        h2 {
-            color: var(--primary-text) !important;
-            font-weight: 700 !important;
-            margin-top: 1rem !important;
-            margin-bottom: 0.75rem !important;
-            font-size: 1.5rem !important;
-        }
-        
-        /* Horizontal dividers - compact */
-        hr {
-            border-color: var(--info-blue) !important;
-            border-width: 2px !important;
-            margin: 1rem 0 !important;
-        }
-        
-        /* Info messages */
-        .stInfo {
-            background-color: rgba(59, 130, 246, 0.1) !important;
-            border-left: 4px solid var(--info-blue) !important;
-            padding: 1rem !important;
-            border-radius: 6px !important;
-        }
-        
-        /* Status update text with pulsing animation */
-        .status-update-text {
-            color: var(--primary-text) !important;
-            font-size: 0.95rem !important;
-            padding: 0 !important;
-            margin: 0 !important;
-            animation: pulse 2s ease-in-out infinite;
-            line-height: 1.5 !important;
-        }
-        
-        /* Remove paragraph default margins for status text */
-        [data-testid="stChatMessage"] [data-testid="stChatMessageContent"] p.status-update-text {
-            margin: 0 !important;
-            padding: 0 !important;
-        }
-        
-        /* Align status container with chat message avatar - assistant messages */
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] .status-update-text {
-            color: var(--primary-text) !important;
-            display: block !important;
-            line-height: 1.5 !important;
-        }
-        
-        /* Ensure status container has no extra padding */
-        [data-testid="stChatMessage"] [data-testid="stChatMessageContent"] [data-testid="stVerticalBlock"]:has(.status-update-text),
-        [data-testid="stChatMessage"] [data-testid="stChatMessageContent"] div:has(.status-update-text) {
-            padding: 0 !important;
-            margin: 0 !important;
-        }
-        
-        @keyframes pulse {
-            0%, 100% {
-                opacity: 1;
-            }
-            50% {
-                opacity: 0.6;
-            }
-        }
-        
-        /* Minimalistic expander styling - match status text style */
-        [data-testid="stExpander"] {
-            border: none !important;
-            box-shadow: none !important;
-            background: transparent !important;
-            margin: 0.5rem 0 !important;
-            outline: none !important;
-        }
-        
-        [data-testid="stExpander"] > div {
-            border: none !important;
-            background: transparent !important;
-            outline: none !important;
-        }
-        
-        /* Expander header (button) - minimalistic, match status text */
-        [data-testid="stExpander"] summary {
-            border: none !important;
-            outline: none !important;
-            background: transparent !important;
-            padding: 0 !important;
-            margin: 0 !important;
-            font-weight: 400 !important;
-            font-size: 0.95rem !important;
-            color: var(--primary-text) !important;
-            cursor: pointer !important;
-            transition: all 0.2s ease !important;
-            border-radius: 8px !important;
-            display: flex !important;
-            align-items: center !important;
-            list-style: none !important;
-        }
-        
-        /* Expander in assistant chat messages */
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stExpander"] summary {
-            color: var(--primary-text) !important;
-        }
-        
-        /* Curved hover effect - subtle background with rounded corners */
-        [data-testid="stExpander"] summary:hover {
-            background: rgba(0, 0, 0, 0.05) !important;
-            border-radius: 8px !important;
-        }
-        
-        /* Expander hover in assistant messages */
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stExpander"] summary:hover {
-            background: rgba(240, 240, 240, 0.1) !important;
-        }
-        
-        /* Expander content area - distinguished with subtle background and indentation */
-        [data-testid="stExpander"] [data-testid="stExpanderContent"] {
-            border: none !important;
-            outline: none !important;
-            background: rgba(0, 0, 0, 0.02) !important;
-            padding: 0.75rem 1rem !important;
-            margin-top: 0.25rem !important;
-            margin-left: 0.5rem !important;
-            border-radius: 8px !important;
-            border-left: 2px solid rgba(0, 0, 0, 0.1) !important;
-        }
-        
-        /* For assistant chat messages, use lighter background and soft white border */
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stExpander"] [data-testid="stExpanderContent"] {
-            background: rgba(240, 240, 240, 0.05) !important;
-            border-left: 2px solid rgba(240, 240, 240, 0.2) !important;
-        }
-        
-        [data-testid="stExpander"][open] [data-testid="stExpanderContent"] {
-            background: rgba(0, 0, 0, 0.03) !important;
-            border-left: 2px solid rgba(0, 0, 0, 0.15) !important;
-        }
-        
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stExpander"][open] [data-testid="stExpanderContent"] {
-            background: rgba(240, 240, 240, 0.08) !important;
-            border-left: 2px solid rgba(240, 240, 240, 0.3) !important;
-        }
-        
-        /* Ensure no borders on expander container */
-        [data-testid="stExpander"] details {
-            border: none !important;
-            outline: none !important;
-            background: transparent !important;
-        }
-        
-        /* File uploader - Compact styling */
-        [data-testid="stFileUploader"] {
-            border: 2px dashed var(--info-blue) !important;
-            border-radius: 8px !important;
-            background: rgba(59, 130, 246, 0.03) !important;
-            padding: 1rem !important;
-            transition: all 0.2s ease !important;
-            min-height: 60px !important;
-            width: 100% !important;
-        }
-        
-        [data-testid="stFileUploader"]:hover {
-            border-color: var(--info-blue) !important;
-            background: rgba(59, 130, 246, 0.05) !important;
-            box-shadow: 0 2px 8px rgba(59, 130, 246, 0.1) !important;
-        }
-        
-        /* Selected files preview */
-        h3 {
-            color: var(--primary-text) !important;
-            font-weight: 600 !important;
-            font-size: 1.2rem !important;
-            margin-top: 1.5rem !important;
-            margin-bottom: 1rem !important;
-        }
-        
-        /* File uploader label - compact */
-        [data-testid="stFileUploader"] label {
-            color: var(--primary-text) !important;
-            font-weight: 500 !important;
-            font-size: 0.95rem !important;
-            margin-bottom: 0.5rem !important;
-        }
-        
-        /* File name container - simple, clean styling */
-        [data-testid="stFileUploader"] [data-testid="stFileUploaderFileName"] {
-            background-color: var(--ui-panel) !important;
-            border: 1px solid rgba(82, 82, 82, 0.3) !important;
-            border-radius: 6px !important;
-            padding: 0.5rem 0.75rem !important;
-            margin: 0.5rem 0 !important;
-            transition: all 0.15s ease !important;
-            display: flex !important;
-            align-items: center !important;
-            justify-content: space-between !important;
-            gap: 0.5rem !important;
-            position: relative !important;
-        }
-        
-        [data-testid="stFileUploader"] [data-testid="stFileUploaderFileName"]:hover {
-            background-color: var(--ui-panel) !important;
-            opacity: 0.9 !important;
-            border-color: var(--info-blue) !important;
-        }
-        
-        /* File name text - simple */
-        [data-testid="stFileUploader"] [data-testid="stFileUploaderFileName"] > *:first-child,
-        [data-testid="stFileUploader"] [data-testid="stFileUploaderFileName"] span:first-of-type,
-        [data-testid="stFileUploader"] [data-testid="stFileUploaderFileName"] div:first-of-type {
-            color: var(--primary-text) !important;
-            font-weight: 400 !important;
-            font-size: 0.875rem !important;
-            white-space: nowrap !important;
-            overflow: hidden !important;
-            text-overflow: ellipsis !important;
-            flex: 1 !important;
-            min-width: 0 !important;
-        }
-        
-        /* File size - simple, aligned to right */
-        [data-testid="stFileUploader"] [data-testid="stFileUploaderFileSize"],
-        [data-testid="stFileUploader"] [data-testid="stFileUploaderFileName"] + [data-testid="stFileUploaderFileSize"],
-        [data-testid="stFileUploader"] span[data-testid="stFileUploaderFileSize"],
-        [data-testid="stFileUploader"] [data-testid="stFileUploaderFileName"] ~ span,
-        [data-testid="stFileUploader"] [data-testid="stFileUploaderFileName"] ~ div,
-        [data-testid="stFileUploader"] [data-testid="stFileUploaderFileName"] > [data-testid="stFileUploaderFileSize"],
-        [data-testid="stFileUploader"] [data-testid="stFileUploaderFileName"] span:last-child,
-        [data-testid="stFileUploader"] [data-testid="stFileUploaderFileName"] div:last-child:not(:first-child) {
-            color: var(--secondary-text) !important;
-            font-size: 0.8rem !important;
-            font-weight: 400 !important;
-            margin-left: auto !important;
-            margin-right: 0.5rem !important;
-            white-space: nowrap !important;
-            flex-shrink: 0 !important;
-        }
-        
-        /* File uploader browse button */
-        [data-testid="stFileUploader"] button {
-            background-color: transparent !important;
-            border: none !important;
-            color: var(--info-blue) !important;
-            font-size: 1rem !important;
-            padding: 0.25rem 0.5rem !important;
-            cursor: pointer !important;
-            transition: all 0.15s ease !important;
-            border-radius: 4px !important;
-        }
-        
-        [data-testid="stFileUploader"] button:hover {
-            background-color: rgba(59, 130, 246, 0.1) !important;
-            color: var(--info-blue) !important;
-        }
-        
-        /* Success messages */
-        .stSuccess {
-            background-color: var(--verification-green);
-            color: #ffffff;
-        }
-        
-        /* Input field */
-        .stTextInput > div > div > input {
-            border-color: rgba(82, 82, 82, 0.3);
-        }
-        
-        .stTextInput > div > div > input:focus {
-            border-color: var(--info-blue);
-            box-shadow: 0 0 0 2px rgba(59, 130, 246, 0.1);
-        }
-        
-        /* Textarea styling - Cursor-style minimal design */
-        .stTextArea > div > div > textarea {
-            background-color: var(--ui-panel) !important;
-            border: 1px solid rgba(82, 82, 82, 0.3) !important;
-            border-radius: 6px !important;
-            padding: 0.75rem 0.875rem !important;
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif !important;
-            font-size: 0.875rem !important;
-            line-height: 1.6 !important;
-            color: var(--primary-text) !important;
-            box-shadow: none !important;
-            transition: all 0.15s ease !important;
-            resize: vertical !important;
-            outline: none !important;
-        }
-        
-        .stTextArea > div > div > textarea:focus {
-            border-color: var(--info-blue) !important;
-            box-shadow: none !important;
-            outline: none !important;
-            outline-width: 0 !important;
-            outline-style: none !important;
-            outline-color: transparent !important;
-            background-color: var(--ui-panel) !important;
-        }
-        
-        .stTextArea > div > div > textarea:focus-visible {
-            outline: none !important;
-            outline-width: 0 !important;
-            outline-style: none !important;
-            outline-color: transparent !important;
-        }
-        
-        .stTextArea > div > div > textarea:hover {
-            border-color: rgba(82, 82, 82, 0.5) !important;
-        }
-        
-        /* Textarea container */
-        .stTextArea > div {
-            background-color: transparent !important;
-        }
-        
-        /* Chat input */
-        .stChatInputContainer {
-            background-color: var(--ui-panel);
-            border-top: 1px solid rgba(82, 82, 82, 0.3);
-        }
-        /* Citations/References - in main markdown */
-        .stMarkdown strong {
-            color: var(--primary-text);
-        }
-        
-        /* References heading in assistant messages */
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) 
-        [data-testid="stChatMessageContent"] strong {
-            color: var(--primary-text) !important;
-        }
-        
-        /* Verification badges - pill-shaped indicators */
-        .verification-badge {
-            display: inline-block;
-            padding: 3px 10px;
-            margin-left: 6px;
-            margin-right: 8px;
-            border-radius: 12px;
-            font-size: 11px;
-            font-weight: 600;
-            vertical-align: middle;
-            line-height: 1.4;
-            letter-spacing: 0.02em;
-            text-transform: uppercase;
-            min-width: 110px;
-            width: auto;
-            text-align: center;
-            box-sizing: border-box;
-            white-space: nowrap;
-        }
-        .verification-badge.verified {
-            background-color: var(--verification-green);
-            color: white;
-        }
-        .verification-badge.unverified {
-            background-color: var(--warning-orange);
-            color: white;
-            position: relative;
-            cursor: help;
-        }
-        .verification-badge.refuted {
-            background-color: var(--user-error-red);
-            color: white;
-        }
-        
-        /* Force all text in assistant messages to use primary text color - override any other styles */
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] p,
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] span:not(.verification-badge),
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] div:not(.verification-badge),
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] *:not(.verification-badge):not(.verification-badge *) {
-            color: var(--primary-text) !important;
-        }
-        
-        /* Tooltip for unverified/extrapolated badges */
-        .verification-badge.unverified:hover::after {
-            content: "This statement is part of the synthesized summary but could not be directly verified from the cited text. Please review the source for full context.";
-            position: absolute;
-            bottom: 100%;
-            left: 50%;
-            transform: translateX(-50%);
-            margin-bottom: 8px;
-            padding: 0.75rem 1rem;
-            background-color: var(--primary-text);
-            color: var(--background);
-            font-size: 0.875rem;
-            font-weight: 400;
-            white-space: normal;
-            width: 280px;
-            border-radius: 6px;
-            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.15);
-            z-index: 1000;
-            pointer-events: none;
-            text-transform: none;
-            line-height: 1.5;
-            text-align: left;
-        }
-        
-        /* Tooltip arrow */
-        .verification-badge.unverified:hover::before {
-            content: "";
-            position: absolute;
-            bottom: 92%;
-            left: 50%;
-            transform: translateX(-50%);
-            border: 6px solid transparent;
-            border-top-color: var(--primary-text);
-            z-index: 1001;
-            pointer-events: none;
-        }
-        
-        /* Badge in claim list - no left margin */
-        .claim-item-badge {
-            margin-left: 0 !important;
-        }
-        
-        /* Links in citations */
-        .stMarkdown a {
-            color: var(--info-blue);
-        }
-        
-        .stMarkdown a:hover {
-            color: var(--info-blue);
-            opacity: 0.8;
-        }
-        
-        /* Reference list items - simple, clean styling */
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) 
-        [data-testid="stChatMessageContent"] ul {
-            border-left: 2px solid rgba(82, 82, 82, 0.3);
-            padding-left: 16px;
-        }
-        
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) 
-        [data-testid="stChatMessageContent"] ol {
-            padding-left: 16px;
-        }
-        
-        [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) 
-        [data-testid="stChatMessageContent"] li {
-            color: var(--primary-text) !important;
-            margin-bottom: 0.25rem;
-        }
-        
-        /* Spinner */
-        .stSpinner > div {
-            border-color: var(--info-blue);
-        }
-        
-        /* Dark mode specific overrides */
-        @media (prefers-color-scheme: dark) {
-            .stApp {
-                background-color: var(--background);
-            }
-            
-            .main .block-container {
-                background-color: var(--background);
-            }
-            
-            h1 {
-                color: var(--primary-text) !important;
-            }
-            
-            .stMarkdown p {
-                color: var(--primary-text);
-            }
-            
-            [data-testid="stSidebar"] {
-                background-color: var(--ui-panel);
-            }
-            
-            h2 {
-                color: var(--primary-text) !important;
-            }
-            
-            .stInfo {
-                background-color: rgba(59, 130, 246, 0.15) !important;
-                border-left-color: var(--info-blue) !important;
-            }
-            
-            [data-testid="stFileUploader"] {
-                background-color: var(--ui-panel);
-                border-color: var(--secondary-text);
-            }
-            
-            .drag-drop-overlay {
-                background: rgba(59, 130, 246, 0.15);
-                border-color: var(--info-blue);
-            }
-            
-            .drag-drop-overlay-content {
-                background: var(--ui-panel);
-                border-color: var(--info-blue);
-            }
-            
-            .drag-drop-overlay-content h2 {
-                color: var(--info-blue);
-            }
-            
-            .drag-drop-overlay-content p {
-                color: var(--secondary-text);
-            }
-            
-            /* Status text - dark mode */
-            .status-update-text {
-                color: var(--primary-text) !important;
-            }
-            
-            /* Expander - dark mode */
-            [data-testid="stExpander"] summary {
-                color: var(--primary-text) !important;
-            }
-            
-            [data-testid="stExpander"] summary:hover {
-                background: rgba(255, 255, 255, 0.05) !important;
-            }
-            
-            [data-testid="stExpander"] [data-testid="stExpanderContent"] {
-                background: rgba(255, 255, 255, 0.03) !important;
-                border-left: 2px solid rgba(170, 170, 170, 0.3) !important;
-            }
-            
-            [data-testid="stExpander"][open] [data-testid="stExpanderContent"] {
-                background: rgba(255, 255, 255, 0.05) !important;
-                border-left: 2px solid rgba(170, 170, 170, 0.5) !important;
-            }
-            
-            /* Expander in assistant messages */
-            [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stExpander"] summary {
-                color: var(--primary-text) !important;
-            }
-            
-            [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stExpander"] summary:hover {
-                background: rgba(255, 255, 255, 0.1) !important;
-            }
-            
-            [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stExpander"] [data-testid="stExpanderContent"] {
-                background: rgba(255, 255, 255, 0.05) !important;
-                border-left: 2px solid rgba(170, 170, 170, 0.3) !important;
-            }
-            
-            [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stExpander"][open] [data-testid="stExpanderContent"] {
-                background: rgba(255, 255, 255, 0.08) !important;
-                border-left: 2px solid rgba(170, 170, 170, 0.5) !important;
-            }
-            
-            [data-testid="stFileUploader"] [data-testid="stFileUploaderFileName"] {
-                background-color: var(--ui-panel) !important;
-                border-color: rgba(170, 170, 170, 0.3) !important;
-            }
-            
-            [data-testid="stFileUploader"] [data-testid="stFileUploaderFileName"]:hover {
-                background-color: var(--ui-panel) !important;
-                opacity: 0.9 !important;
-                border-color: var(--info-blue) !important;
-            }
-            
-            [data-testid="stFileUploader"] [data-testid="stFileUploaderFileName"] span,
-            [data-testid="stFileUploader"] [data-testid="stFileUploaderFileName"] div {
-                color: var(--primary-text) !important;
-            }
-            
-            /* Textarea dark mode styling - Cursor-style */
-            .stTextArea > div > div > textarea {
-                background-color: var(--ui-panel) !important;
-                border: 1px solid rgba(170, 170, 170, 0.3) !important;
-                color: var(--primary-text) !important;
-                box-shadow: none !important;
-                outline: none !important;
-            }
-            
-            .stTextArea > div > div > textarea:focus {
-                border-color: var(--info-blue) !important;
-                box-shadow: none !important;
-                outline: none !important;
-                outline-width: 0 !important;
-                outline-style: none !important;
-                outline-color: transparent !important;
-                background-color: var(--ui-panel) !important;
-            }
-            
-            .stTextArea > div > div > textarea:focus-visible {
-                outline: none !important;
-                outline-width: 0 !important;
-                outline-style: none !important;
-                outline-color: transparent !important;
-            }
-            
-            .stTextArea > div > div > textarea:hover {
-                border-color: rgba(170, 170, 170, 0.5) !important;
-            }
-            
-            .stChatInputContainer {
-                background-color: var(--ui-panel);
-                border-top: 1px solid rgba(170, 170, 170, 0.3);
-            }
-            
-            /* Dark mode chat messages */
-            [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="user"]) [data-testid="stChatMessageContent"] {
-                background-color: var(--user-error-red);
-            }
-            
-            [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatar"] [data-icon="assistant"]) [data-testid="stChatMessageContent"] {
-                background-color: var(--ui-panel);
-                color: var(--primary-text) !important;
-            }
-        }
-
-        /* Hide the Streamlit header and footer */
-        #MainMenu {visibility: hidden;}
-        footer {visibility: hidden;}
-        header {visibility: hidden;}
-        
-        /* Ensure sidebar toggle button remains visible and functional */
-        [data-testid="stSidebarCollapseButton"],
-        button[data-testid="stSidebarCollapseButton"],
-        [aria-label*="sidebar"][aria-label*="toggle"],
-        button[aria-label*="Open sidebar"],
-        button[aria-label*="Close sidebar"] {
-            visibility: hidden !important;
-            display: none !important;
-        }
-        
-        /* Ensure sidebar toggle button icon is visible */
-        [data-testid="stSidebarCollapseButton"] svg,
-        button[data-testid="stSidebarCollapseButton"] svg,
-        [data-testid="stSidebarCollapseButton"]::before,
-        [data-testid="stSidebarCollapseButton"]::after {
-            display: block !important;
-            visibility: visible !important;
-        }
-        
-        /* Custom sidebar toggle icon styling */
-        [data-testid="stSidebarCollapseButton"] .custom-sidebar-icon {
-            width: 20px !important;
-            height: 20px !important;
-            fill: currentColor !important;
-            stroke: currentColor !important;
-            color: var(--primary-text) !important;
-        }
-        
-        /* Hide text/aria-label and show icon */
-        [data-testid="stSidebarCollapseButton"] .sr-only,
-        [data-testid="stSidebarCollapseButton"] [class*="sr-only"],
-        button[aria-label*="sidebar"] .sr-only {
-            position: absolute !important;
-            width: 1px !important;
-            height: 1px !important;
-            padding: 0 !important;
-            margin: -1px !important;
-            overflow: hidden !important;
-            clip: rect(0, 0, 0, 0) !important;
-            white-space: nowrap !important;
-            border: 0 !important;
-        }
-        
-        </style>
-        """
+    return CSS
 
 
 def inject_custom_css() -> None:
     """Inject custom CSS for medical research UI with IBM brand colors.
 
-    Optimized with caching to avoid re-injecting on every rerun.
+    The prebuilt style block is emitted on every run: Streamlit removes any
+    element a rerun does not produce again, so a once-per-session guard would
+    drop the styles after the first interaction.
     """
-    css_content = get_css_content()
-    # Use a key to ensure CSS is only injected once per session
-    if "_css_injected" not in st.session_state:
-        st.markdown(css_content, unsafe_allow_html=True)
-        st.session_state["_css_injected"] = True
-    else:
-        # Still inject CSS but Streamlit will optimize it
-        st.markdown(css_content, unsafe_allow_html=True)
+    st.markdown(CSS, unsafe_allow_html=True)
 
 
 def init_state() -> None:
     """Initialize Streamlit session state variables."""
     if "messages" not in st.session_state:
         st.session_state["messages"] = []
+    if "chat_window" not in st.session_state:
+        st.session_state["chat_window"] = _CHAT_WINDOW
     if "ingested_docs" not in st.session_state:
         st.session_state["ingested_docs"] = []
     if "show_upload_ui" not in st.session_state:
         # Hide upload UI by default if documents exist, show if no documents
-        has_docs = len(st.session_state.get("ingested_docs", [])) > 0
-        st.session_state["show_upload_ui"] = not has_docs
+        st.session_state["show_upload_ui"] = not st.session_state["ingested_docs"]
     if "report_text" not in st.session_state:
         st.session_state["report_text"] = ""
+    if "_flagged_report_keys" not in st.session_state:
+        st.session_state["_flagged_report_keys"] = set()
+    if "current_page" not in st.session_state:
+        st.session_state["current_page"] = "assistant"
+
+
+def _prepare_upload(
+    ingestion: IngestionPipeline, doc_id: str, filename: str, data: bytes
+) -> PreparedDocument:
+    """Upload a PDF to COS, then parse and embed it (worker-thread safe).
+
+    Tables are left for IngestionPipeline.prepare_tables() on the script
+    thread.
+
+    Args:
+        ingestion: IngestionPipeline instance for processing documents.
+        doc_id: Document identifier.
+        filename: Name of the uploaded file.
+        data: Raw PDF bytes, owned by the calling thread.
+
+    Returns:
+        The prepared document, ready for IngestionPipeline.index_document().
+    """
+    source_uri = ingestion.upload_to_cos(doc_id, filename, io.BytesIO(data))
+    return ingestion.prepare_pdf(
+        doc_id, filename, source_uri, io.BytesIO(data), tables=False
+    )
 
 
 def upload_section(ingestion: IngestionPipeline) -> list | None:
@@ -1090,7 +207,8 @@ def upload_section(ingestion: IngestionPipeline) -> list | None:
     Returns:
         List of uploaded files if any, None otherwise.
     """
-    has_documents = len(st.session_state.get("ingested_docs", [])) > 0
+    # init_state() guarantees the list exists, so its truthiness is enough
+    has_documents = bool(st.session_state["ingested_docs"])
 
     # Check if answer generation is in progress (status callback indicates generation)
     is_generating = "_status_callback" in st.session_state
@@ -1141,9 +259,6 @@ def upload_section(ingestion: IngestionPipeline) -> list | None:
         label_visibility="visible",
     )
 
-    # Check if answer generation is in progress
-    is_generating = "_status_callback" in st.session_state
-
     # Ingest button below uploader
     if uploaded_files:
         ingest_button = st.button(
@@ -1161,14 +276,33 @@ def upload_section(ingestion: IngestionPipeline) -> list | None:
 
     # Don't process during generation to avoid interruption
     if uploaded_files and ingest_button and not is_generating:
-        with st.spinner(f"Processing {len(uploaded_files)} file(s)..."):
-            for f in uploaded_files:
-                doc_id = str(uuid.uuid4())
-                with st.spinner(f"Uploading and ingesting {f.name}..."):
-                    source_uri = ingestion.upload_to_cos(doc_id, f.name, f)
-                    count = ingestion.ingest_pdf(doc_id, f.name, source_uri)
+        # Upload, parsing and embedding are I/O-bound and touch no session
+        # state, so run them per file in worker threads. Table extraction
+        # (camelot is not thread-safe) and indexing (writes session state)
+        # stay on the script thread, one file at a time in upload order
+        files = [(f.name, f.getvalue()) for f in uploaded_files]
+        progress = st.progress(0.0, text=f"Processing {len(files)} file(s)...")
+        ingested = 0
+        with ThreadPoolExecutor(max_workers=min(8, len(files))) as pool:
+            futures = [
+                pool.submit(
+                    _prepare_upload, ingestion, secrets.token_hex(16), filename, data
+                )
+                for filename, data in files
+            ]
+            for done, ((filename, data), future) in enumerate(
+                zip(files, futures, strict=True)
+            ):
+                progress.progress(done / len(files), text=f"Ingesting {filename}...")
+                try:
+                    prepared = future.result()
+                    ingestion.prepare_tables(prepared, filename, io.BytesIO(data))
+                    count = ingestion.index_document(prepared)
+                except Exception as e:
+                    st.error(f"Error ingesting {filename}: {e}")
+                    continue
                 # Store document info: (doc_id, filename, source_uri, count, title, author)
-                # ingest_pdf returns (upserted_count, metadata_dict)
+                # index_document returns (upserted_count, metadata_dict)
                 if isinstance(count, tuple) and len(count) == 2:
                     chunk_count, metadata = count
                     title = metadata.get("title") if metadata else None
@@ -1178,17 +312,46 @@ def upload_section(ingestion: IngestionPipeline) -> list | None:
                     title = None
                     author = None
                 st.session_state["ingested_docs"].append(
-                    (doc_id, f.name, source_uri, chunk_count, title, author)
+                    (
+                        prepared.doc_id,
+                        filename,
+                        prepared.source_uri,
+                        chunk_count,
+                        title,
+                        author,
+                    )
                 )
-        st.success(f"Successfully ingested {len(uploaded_files)} document(s)")
-        # Hide upload UI after successful ingestion
-        st.session_state["show_upload_ui"] = False
-        # Rerun needed to show new documents and update UI
-        st.rerun()
+                ingested += 1
+        progress.empty()
+        if ingested:
+            st.success(f"Successfully ingested {ingested} document(s)")
+        if ingested == len(files):
+            # Hide upload UI after successful ingestion
+            st.session_state["show_upload_ui"] = False
+            # Rerun needed to show new documents and update UI
+            st.rerun()
 
     return uploaded_files
 
 
+def _docs_by_uri() -> dict[str, tuple]:
+    """Return ingested document info keyed by source URI.
+
+    The index lives in session state. ingested_docs is append-only, so only
+    documents added since the last call are indexed.
+
+    Returns:
+        Mapping of source URI to its ingested_docs tuple.
+    """
+    ingested_docs = st.session_state.get("ingested_docs", [])
+    doc_by_uri = st.session_state.setdefault("_doc_by_uri", {})
+    indexed = st.session_state.get("_doc_by_uri_len", 0)
+    if indexed != len(ingested_docs):
+        doc_by_uri.update((d[2], d) for d in ingested_docs[indexed:] if len(d) >= 3)
+        st.session_state["_doc_by_uri_len"] = len(ingested_docs)
+    return doc_by_uri
+
+
 def format_references_with_titles(sources: list[str]) -> str:
     """Format references with document titles and download links.
 
@@ -1202,25 +365,17 @@ def format_references_with_titles(sources: list[str]) -> str:
         return ""
 
     formatted_refs = []
-    ingested_docs = st.session_state.get("ingested_docs", [])
+    doc_by_uri = _docs_by_uri()
 
     for source_uri in sources:
-        # Find document info by source_uri
-        doc_title = None
-        doc_filename = None
-        for doc_info in ingested_docs:
-            if len(doc_info) >= 3 and doc_info[2] == source_uri:
-                doc_filename = doc_info[1] if len(doc_info) >= 2 else None
-                # Get title if available (position 4), fallback to filename
-                if len(doc_info) >= 5:
-                    doc_title = doc_info[4] or doc_filename
-                else:
-                    doc_title = doc_filename
-                break
-
-        # Create display name
+        # Prefer the document title (position 4), then the filename, then the
+        # last URI segment
+        doc_info = doc_by_uri.get(source_uri, ())
         display_name = (
-            doc_title or doc_filename or source_uri.split("/")[-1] or "Document"
+            (doc_info[4] if len(doc_info) >= 5 else None)
+            or (doc_info[1] if doc_info else None)
+            or source_uri.rsplit("/", 1)[-1]
+            or "Document"
         )
 
         # Create download link using Streamlit's download button approach
@@ -1231,6 +386,19 @@ def format_references_with_titles(sources: list[str]) -> str:
     return "\n".join(formatted_refs)
 
 
+@functools.lru_cache(maxsize=256)
+def _download_key(source_uri: str) -> str:
+    """Derive the download key for a source URI.
+
+    Args:
+        source_uri: S3 URI of the document.
+
+    Returns:
+        16-character hex BLAKE2b digest of the URI.
+    """
+    return hashlib.blake2b(source_uri.encode(), digest_size=8).hexdigest()
+
+
 def create_download_link(source_uri: str, ingestion: IngestionPipeline) -> str:
     """Create a download link for a document from COS.
 
@@ -1242,7 +410,7 @@ def create_download_link(source_uri: str, ingestion: IngestionPipeline) -> str:
         Download key for the document.
     """
     # Create a unique key for this download
-    download_key = hashlib.md5(source_uri.encode()).hexdigest()[:16]
+    download_key = _download_key(source_uri)
 
     # Store the source URI in session state for download handler
     if "download_cache" not in st.session_state:
@@ -1253,6 +421,24 @@ def create_download_link(source_uri: str, ingestion: IngestionPipeline) -> str:
     return download_key
 
 
+@functools.lru_cache(maxsize=256)
+def _parse_s3_uri(uri: str) -> tuple[str, str] | None:
+    """Split an s3://bucket/key URI into its bucket and key.
+
+    Args:
+        uri: S3 URI of the document.
+
+    Returns:
+        (bucket, key) tuple, or None if the URI is not a valid S3 URI.
+    """
+    if not uri.startswith("s3://"):
+        return None
+    bucket, sep, key = uri.removeprefix("s3://").partition("/")
+    if not sep:
+        return None
+    return bucket, key
+
+
 def download_document_from_cos(
     download_key: str, ingestion: IngestionPipeline
 ) -> bytes:
@@ -1272,22 +458,100 @@ def download_document_from_cos(
     if not source_uri:
         return b""
 
-    # Fetch from COS
-    try:
-        # Parse s3://bucket/key
-        if not source_uri.startswith("s3://"):
-            return b""
+    location = _parse_s3_uri(source_uri)
+    if location is None:
+        return b""
 
-        _, rest = source_uri.split("s3://", 1)
-        bucket, key = rest.split("/", 1)
+    # Serve repeat downloads from the per-session cache
+    body_cache = st.session_state.setdefault("_cos_body_cache", {})
+    if location in body_cache:
+        return body_cache[location]
 
-        # Get object from COS
+    # Fetch from COS
+    try:
+        bucket, key = location
         obj = ingestion.cos.client.get_object(Bucket=bucket, Key=key)
-        return obj["Body"].read()
+        body = obj["Body"].read()
     except Exception as e:
         st.error(f"Error downloading document: {e}")
         return b""
 
+    if len(body_cache) >= _COS_BODY_CACHE_SIZE:
+        # Evict the oldest entry (dicts keep insertion order)
+        body_cache.pop(next(iter(body_cache)))
+    body_cache[location] = body
+    return body
+
+
+def _extract_sources(text: str) -> list[str]:
+    """Collect the distinct S3 URIs cited in a block of text.
+
+    Args:
+        text: References section or report text to scan.
+
+    Returns:
+        URIs in first-seen order, with trailing list punctuation removed.
+    """
+    sources = {}
+    for match in _S3_URI_RE.finditer(text):
+        sources.setdefault(match.group(0).rstrip("-.,;)"), None)
+    return list(sources)
+
+
+def _answer_key(answer: str, sources: list[str]) -> str:
+    """Build the stable key used for an answer's report flag.
+
+    Unlike the builtin hash(), the digest does not change between processes.
+
+    Args:
+        answer: Answer text without the References section.
+        sources: Source URIs cited by the answer.
+
+    Returns:
+        16-character hex digest of the answer and its sorted sources.
+    """
+    h = hashlib.blake2b(answer.encode(), digest_size=8)
+    for source in sorted(sources):
+        h.update(b"\0")
+        h.update(source.encode())
+    return h.hexdigest()
+
+
+def _message_sources(idx: int) -> list[str]:
+    """Return the source URIs stored with the assistant message at idx.
+
+    chat_ui stores each answer's pipeline sources under its message index.
+    The references block in the message content lists titles only, so it
+    cannot be parsed back into URIs; report keys must come from here.
+
+    Args:
+        idx: Index of the assistant message in messages.
+
+    Returns:
+        Source URIs of the answer, empty if none were stored.
+    """
+    return st.session_state.get("_message_sources", {}).get(idx, [])
+
+
+def _set_report_flag(key: str) -> None:
+    """Mark an answer as added to the report.
+
+    Args:
+        key: Report flag key ("_report_item_{hash}" or "_report_new_{hash}").
+    """
+    st.session_state[key] = True
+    st.session_state.setdefault("_flagged_report_keys", set()).add(key)
+
+
+def _clear_report_flag(key: str) -> None:
+    """Remove a report flag and drop it from the flag index.
+
+    Args:
+        key: Report flag key to clear.
+    """
+    st.session_state.pop(key, None)
+    st.session_state.get("_flagged_report_keys", set()).discard(key)
+
 
 def _clean_report_flags() -> None:
     """Clear report flags for answers no longer in the report text.
@@ -1297,11 +561,21 @@ def _clean_report_flags() -> None:
     """
     report_text = st.session_state.get("report_text", "")
 
-    # Get all report flags from session state
-    report_keys = [key for key in st.session_state.keys() if key.startswith("_report_")]
+    # Snapshot the flag index; clearing a flag removes it from the set
+    report_keys = list(st.session_state.get("_flagged_report_keys", ()))
 
-    # Check messages to find corresponding answers
-    messages = st.session_state.get("messages", [])
+    if not report_keys:
+        return
+
+    # Index assistant answers once: answer key -> snippet used to spot it in the report
+    answer_snippets = {}
+    for idx, (role, content) in enumerate(st.session_state.get("messages", [])):
+        if role == "assistant":
+            answer_only = content.partition(_REFS_SENTINEL)[0].strip()
+            answer_snippets.setdefault(
+                _answer_key(answer_only, _message_sources(idx)),
+                answer_only[:100].strip(),
+            )
 
     for key in report_keys:
         # Extract answer_hash from key (format: "_report_item_{hash}" or "_report_new_{hash}")
@@ -1312,46 +586,13 @@ def _clean_report_flags() -> None:
         else:
             continue
 
-        # Find the corresponding answer in messages
-        answer_found = False
-        for role, content in messages:
-            if role == "assistant":
-                # Try to extract answer from content (before References section)
-                answer_only = (
-                    content.split("**References:**")[0].strip()
-                    if "**References:**" in content
-                    else content.strip()
-                )
-
-                # Get sources from content
-                sources = []
-                if "**References:**" in content:
-                    import re
-
-                    refs_text = content.split("**References:**", 1)[1]
-                    source_uris = re.findall(r"s3://[^\s\n]+", refs_text)
-                    sources = source_uris
-
-                # Calculate hash to match (use consistent string representation)
-                answer_hash = hash((answer_only, str(sorted(sources))))
-                hash_str_match = str(answer_hash)
-
-                if hash_str_match == hash_str:
-                    # Check if answer is still in report text
-                    answer_snippet = (
-                        answer_only[:100].strip()
-                        if len(answer_only) > 100
-                        else answer_only.strip()
-                    )
-                    if answer_snippet and answer_snippet not in report_text:
-                        # Answer no longer in report, clear the flag
-                        st.session_state.pop(key, None)
-                    answer_found = True
-                    break
-
-        # If flag exists but no corresponding message found, clear it
-        if not answer_found:
-            st.session_state.pop(key, None)
+        answer_snippet = answer_snippets.get(hash_str)
+        if answer_snippet is None:
+            # Flag exists but no corresponding message found, clear it
+            _clear_report_flag(key)
+        elif answer_snippet and answer_snippet not in report_text:
+            # Answer no longer in report, clear the flag
+            _clear_report_flag(key)
 
 
 def add_to_report(answer: str, sources: list[str], query: str = "") -> None:
@@ -1368,38 +609,37 @@ def add_to_report(answer: str, sources: list[str], query: str = "") -> None:
     # Format the entry (only answer and references, no query)
     # Add spacing only if report is not empty
     report_empty = not st.session_state["report_text"].strip()
-    entry = "" if report_empty else "\n\n"
+    parts = [] if report_empty else ["\n\n"]
     # Strip leading/trailing whitespace from answer
     answer_clean = answer.strip()
-    entry += f"{answer_clean}\n\n"
+    parts.append(f"{answer_clean}\n\n")
 
     if sources:
-        entry += "**References:**\n"
-        ingested_docs = st.session_state.get("ingested_docs", [])
+        parts.append("**References:**\n")
+        doc_by_uri = _docs_by_uri()
 
         for i, source_uri in enumerate(sources, 1):
             # Find document title by source_uri
             doc_title = None
-            for doc_info in ingested_docs:
-                if len(doc_info) >= 3 and doc_info[2] == source_uri:
-                    # Get title if available (position 4), fallback to filename
-                    if len(doc_info) >= 5:
-                        doc_title = doc_info[4]
-                    if not doc_title and len(doc_info) >= 2:
-                        doc_title = doc_info[1]  # Use filename as fallback
-                    break
+            doc_info = doc_by_uri.get(source_uri)
+            if doc_info:
+                # Get title if available (position 4), fallback to filename
+                if len(doc_info) >= 5:
+                    doc_title = doc_info[4]
+                if not doc_title:
+                    doc_title = doc_info[1]  # Use filename as fallback
 
             # Use title if available, otherwise use source URI
             if doc_title:
-                entry += f"{i}. **{doc_title}**\n"
+                parts.append(f"{i}. **{doc_title}**\n")
             else:
                 # Fallback to filename or source URI
                 display_name = (
                     source_uri.split("/")[-1] if "/" in source_uri else source_uri
                 )
-                entry += f"{i}. **{display_name}**\n"
+                parts.append(f"{i}. **{display_name}**\n")
 
-    st.session_state["report_text"] += entry
+    st.session_state["report_text"] += "".join(parts)
 
 
 def generate_bibliography(sources: list[str]) -> str:
@@ -1414,68 +654,61 @@ def generate_bibliography(sources: list[str]) -> str:
     if not sources:
         return ""
 
-    bibliography = "\n\n## Bibliography\n\n"
-
     # Extract unique documents from sources
-    unique_docs = {}
-    ingested_docs = st.session_state.get("ingested_docs", [])
+    entries = []
+    doc_by_uri = _docs_by_uri()
 
-    for source in sources:
+    for source in dict.fromkeys(sources):
         # Find document metadata
-        for doc_info in ingested_docs:
-            if len(doc_info) >= 3 and doc_info[2] == source:
-                title = doc_info[4] if len(doc_info) >= 5 and doc_info[4] else None
-                author = doc_info[5] if len(doc_info) >= 6 and doc_info[5] else None
-                filename = doc_info[1] if len(doc_info) >= 2 else None
-
-                doc_key = source
-                if doc_key not in unique_docs:
-                    unique_docs[doc_key] = {
-                        "title": title,
-                        "author": author,
-                        "filename": filename,
-                        "source_uri": source,
-                    }
-                break
+        doc_info = doc_by_uri.get(source)
+        if doc_info:
+            title = doc_info[4] if len(doc_info) >= 5 and doc_info[4] else None
+            author = doc_info[5] if len(doc_info) >= 6 and doc_info[5] else None
+            filename = doc_info[1] if len(doc_info) >= 2 else None
+            entries.append((title, author, filename, source))
+
+    return _format_bibliography(tuple(entries))
+
+
+@functools.lru_cache(maxsize=32)
+def _format_bibliography(
+    entries: tuple[tuple[str | None, str | None, str | None, str], ...],
+) -> str:
+    """Format resolved document metadata as an APA-style bibliography.
+
+    Args:
+        entries: (title, author, filename, source_uri) per cited document.
+
+    Returns:
+        Formatted bibliography string in APA style.
+    """
+    bibliography = "\n\n## Bibliography\n\n"
 
     # Format in APA style
-    for i, (doc_key, doc_info) in enumerate(unique_docs.items(), 1):
+    for i, (doc_title, doc_author, filename, source_uri) in enumerate(entries, 1):
         # Use title if available, fallback to filename, then source URI
-        title = doc_info.get("title")
-        if not title:
-            filename = doc_info.get("filename", "")
-            if filename:
-                title = filename.replace(".pdf", "").replace(".PDF", "")
-            else:
-                source_uri = doc_info.get("source_uri", "")
-                title = source_uri.split("/")[-1] if "/" in source_uri else source_uri
+        if doc_title:
+            title = doc_title
+        elif filename:
+            title = filename.replace(".pdf", "").replace(".PDF", "")
+        else:
+            title = source_uri.split("/")[-1] if "/" in source_uri else source_uri
 
-        author = doc_info.get("author")
-        if not author:
-            author = "Unknown Author"
+        author = doc_author or "Unknown Author"
 
         # Format as APA citation: Author, A. A. (Year). Title. [Format]. Source
         # Since we don't have year, we'll use: Author, A. A. (n.d.). Title. [PDF document]
         # For multiple authors, format as: Author, A. A., & Author, B. B.
-        # Check if author contains multiple authors (comma or "and")
-        if "," in author or " and " in author.lower():
-            # Multiple authors - format properly
-            if " and " in author.lower():
-                # Split by "and" and format
-                authors = [
-                    a.strip()
-                    for a in re.split(r"\s+and\s+", author, flags=re.IGNORECASE)
-                ]
-                if len(authors) == 2:
-                    formatted_author = f"{authors[0]}, & {authors[1]}"
-                else:
-                    # More than 2 authors - last one gets "&"
-                    formatted_author = ", ".join(authors[:-1]) + ", & " + authors[-1]
+        # Authors joined with "and" are split and re-joined with "&"; single and
+        # comma-separated authors are assumed to be formatted already
+        if " and " in author.lower():
+            authors = [a.strip() for a in _AUTHOR_AND_RE.split(author)]
+            if len(authors) == 2:
+                formatted_author = f"{authors[0]}, & {authors[1]}"
             else:
-                # Comma-separated - assume already formatted
-                formatted_author = author
+                # More than 2 authors - last one gets "&"
+                formatted_author = ", ".join(authors[:-1]) + ", & " + authors[-1]
         else:
-            # Single author
             formatted_author = author
 
         # APA format: Author, A. A. (n.d.). Title. [PDF document].
@@ -1484,6 +717,18 @@ def generate_bibliography(sources: list[str]) -> str:
     return bibliography
 
 
+def _now_formatted(fmt: str) -> str:
+    """Return the current local time formatted with fmt.
+
+    Args:
+        fmt: strftime format string.
+
+    Returns:
+        Formatted local time.
+    """
+    return datetime.now(tz=UTC).astimezone().strftime(fmt)
+
+
 def export_report(format: str = "docx") -> bytes:
     """Export the research report in the specified format.
 
@@ -1497,21 +742,52 @@ def export_report(format: str = "docx") -> bytes:
     if not report_text:
         return b""
 
+    # Skip re-parsing when nothing the export depends on has changed; the
+    # document count stands in for title/author metadata (ingested_docs is
+    # append-only)
+    generated = _now_formatted("%B %d, %Y")
+    export_key = (report_text, len(st.session_state["ingested_docs"]), generated)
+    last_export = st.session_state.get(f"_last_export_{format}")
+    if last_export is not None and last_export[0] == export_key:
+        return last_export[1]
+
     # Extract sources from report text
-    source_pattern = r"s3://[^\s\n]+"
-    all_sources = re.findall(source_pattern, report_text)
-    unique_sources = list(dict.fromkeys(all_sources))
+    bibliography = generate_bibliography(_extract_sources(report_text))
+
+    data = _render_report(format, report_text, bibliography, generated)
+    st.session_state[f"_last_export_{format}"] = (export_key, data)
+    return data
+
+
+def _render_report(
+    format: str, report_text: str, bibliography: str, generated: str
+) -> bytes:
+    """Render report text and bibliography into export bytes.
 
+    Reruns with an unchanged report reuse the per-session result stored by
+    export_report() instead of calling this again.
+
+    Args:
+        format: Export format, either "docx" or "md".
+        report_text: Report markdown from the Synthesis Studio editor.
+        bibliography: Bibliography section from generate_bibliography().
+        generated: Date shown in the DOCX header.
+
+    Returns:
+        Report content as bytes, empty bytes if the format is unsupported.
+    """
     if format == "docx":
         try:
             from docx import Document
-            from docx.shared import Pt
 
             doc = Document()
+            # Resolve the list style once; passing a name makes python-docx
+            # search the styles part on every paragraph
+            list_number = doc.styles["List Number"]
 
             # Title
             doc.add_heading("Synthesis Studio", 0)
-            doc.add_paragraph(f"Generated: {datetime.now().strftime('%B %d, %Y')}")
+            doc.add_paragraph(f"Generated: {generated}")
             doc.add_paragraph("")  # Blank line
 
             # Parse report text and convert to DOCX
@@ -1523,18 +799,21 @@ def export_report(format: str = "docx") -> bytes:
                 line_stripped = line.strip()
                 if not line_stripped:
                     if current_para:
-                        para = doc.add_paragraph(" ".join(current_para))
+                        doc.add_paragraph(" ".join(current_para))
                         current_para = []
-                elif line_stripped.startswith("**References:**"):
+                elif line_stripped.startswith(_REFS_SENTINEL):
                     if current_para:
-                        para = doc.add_paragraph(" ".join(current_para))
+                        doc.add_paragraph(" ".join(current_para))
                         current_para = []
                     doc.add_heading("References", level=2)
                     in_refs_section = True
-                elif in_refs_section and re.match(r"^\d+\.", line_stripped):
+                elif (
+                    in_refs_section
+                    and line_stripped[0].isdigit()
+                    and _NUMBERED_ITEM_RE.match(line_stripped)
+                ):
                     # Reference list item
-                    ref_text = line_stripped
-                    doc.add_paragraph(ref_text, style="List Number")
+                    doc.add_paragraph(line_stripped, style=list_number)
                 # Regular paragraph text
                 elif line_stripped.startswith("**") and line_stripped.endswith("**"):
                     # Bold text
@@ -1546,22 +825,22 @@ def export_report(format: str = "docx") -> bytes:
                 doc.add_paragraph(" ".join(current_para))
 
             # Add bibliography
-            bibliography = generate_bibliography(unique_sources)
             if bibliography:
                 doc.add_page_break()
                 for line in bibliography.split("\n"):
-                    if line.strip():
+                    line_stripped = line.strip()
+                    if line_stripped:
                         if line.startswith("##"):
                             doc.add_heading(line.replace("##", "").strip(), level=2)
-                        elif re.match(r"^\d+\.", line.strip()):
-                            doc.add_paragraph(line.strip(), style="List Number")
+                        elif line_stripped[0].isdigit() and _NUMBERED_ITEM_RE.match(
+                            line_stripped
+                        ):
+                            doc.add_paragraph(line_stripped, style=list_number)
                         else:
-                            doc.add_paragraph(line.strip())
+                            doc.add_paragraph(line_stripped)
 
             # Save to bytes
-            from io import BytesIO
-
-            buffer = BytesIO()
+            buffer = io.BytesIO()
             doc.save(buffer)
             return buffer.getvalue()
         except ImportError:
@@ -1569,7 +848,6 @@ def export_report(format: str = "docx") -> bytes:
 
     elif format == "md":
         md_content = report_text
-        bibliography = generate_bibliography(unique_sources)
         if bibliography:
             md_content += bibliography
 
@@ -1578,6 +856,19 @@ def export_report(format: str = "docx") -> bytes:
     return b""
 
 
+@functools.lru_cache(maxsize=1)
+def _docx_available() -> bool:
+    """Check once per process whether python-docx is installed.
+
+    Uses find_spec so the report page does not import docx (and lxml) until
+    a DOCX is actually built.
+
+    Returns:
+        True if DOCX export is available.
+    """
+    return find_spec("docx") is not None
+
+
 def report_page() -> None:
     """Display and manage the research report page.
 
@@ -1586,38 +877,41 @@ def report_page() -> None:
     st.header("Synthesis Studio")
     st.caption("Build your final deliverable from verified insights")
 
-    # Export buttons at the top
-    try:
-        from docx import Document
-
-        DOCX_AVAILABLE = True
-    except ImportError:
-        DOCX_AVAILABLE = False
-
+    # Export buttons at the top; nothing is exported while the report is empty
+    report_text = st.session_state.get("report_text", "")
+    today = _now_formatted("%Y%m%d")
     col1, col2 = st.columns([1, 4])
 
     with col1:
-        if DOCX_AVAILABLE:
-            docx_data = export_report("docx")
-            st.download_button(
-                label="Export as DOCX",
-                data=docx_data if docx_data else b"",
-                file_name=f"research_report_{datetime.now().strftime('%Y%m%d')}.docx",
-                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                disabled=not st.session_state.get("report_text", ""),
-                use_container_width=True,
-            )
-        else:
+        if not _docx_available():
             st.info("⚠️ python-docx not available. Install it to export as DOCX.")
+        else:
+            # Building the DOCX is the expensive export, so only do it once the
+            # user asks for it; it stays ready until the report text changes
+            docx_ready = bool(report_text) and (
+                st.session_state.get("_docx_export_text") == report_text
+            )
+            if not docx_ready and st.button(
+                "Prepare DOCX", disabled=not report_text, use_container_width=True
+            ):
+                st.session_state["_docx_export_text"] = report_text
+                docx_ready = True
+            if docx_ready:
+                st.download_button(
+                    label="Export as DOCX",
+                    data=export_report("docx"),
+                    file_name=f"research_report_{today}.docx",
+                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                    use_container_width=True,
+                )
 
     with col2:
-        md_data = export_report("md")
         st.download_button(
             label="Export as Markdown",
-            data=md_data if md_data else b"",
-            file_name=f"research_report_{datetime.now().strftime('%Y%m%d')}.md",
+            data=export_report("md") if report_text else b"",
+            file_name=f"research_report_{today}.md",
             mime="text/markdown",
-            disabled=not st.session_state.get("report_text", ""),
+            disabled=not report_text,
             use_container_width=True,
         )
 
@@ -1717,27 +1011,26 @@ def display_agent_trajectory(query: str, trajectory: list[dict]) -> None:
                 content = step_info.get("content", "")
                 details = step_info.get("details", "")
 
-                # Style based on step type
-                if step_type == "planning":
-                    with st.expander(f"{title}", expanded=False):
+                if step_type == "final_answer":
+                    st.success(f"{title}")
+                    if details:
+                        st.caption(details)
+                    continue
+                if step_type not in _TRAJECTORY_STEP_TYPES:
+                    continue
+
+                # Every other step is an expander; only the body styling differs
+                with st.expander(f"{title}", expanded=False):
+                    if step_type == "planning":
                         st.info(content)
-                        if details:
-                            st.caption(details)
-                elif step_type == "decomposition":
-                    with st.expander(f"{title}", expanded=False):
-                        st.markdown(content)
-                        if details:
-                            st.caption(details)
-                elif step_type == "retrieval":
-                    with st.expander(f"{title}", expanded=False):
+                    elif step_type == "retrieval":
                         st.markdown(f"**Query:** {content}")
-                        if details:
-                            st.caption(details)
-                elif step_type == "intermediate_answer":
-                    with st.expander(f"{title}", expanded=False):
+                    else:
                         st.markdown(content)
-                        if details:
-                            st.caption(details)
+                    if details:
+                        st.caption(details)
+
+                    if step_type == "intermediate_answer":
                         # Show full answer in expander
                         full_answer = step_info.get("full_answer", "")
                         if full_answer and len(full_answer) > len(content):
@@ -1749,51 +1042,26 @@ def display_agent_trajectory(query: str, trajectory: list[dict]) -> None:
                         sources = step_info.get("sources", [])
                         if sources:
                             st.caption(f"Sources: {len(sources)}")
-                elif step_type == "synthesis" or step_type == "verification":
-                    with st.expander(f"{title}", expanded=False):
-                        st.markdown(content)
-                        if details:
-                            st.caption(details)
-                elif step_type == "verification_result":
-                    with st.expander(f"{title}", expanded=False):
-                        st.markdown(content)
-                        if details:
-                            st.caption(details)
-                        # Show verification details if available
-                        verification_data = step_info.get("verification_results", [])
-                        if verification_data:
-                            supports = [
-                                r
-                                for r in verification_data
-                                if r.get("status") == "Supports"
-                            ]
-                            refutes = [
-                                r
-                                for r in verification_data
-                                if r.get("status") == "Refutes"
-                            ]
-                            not_mentioned = [
-                                r
-                                for r in verification_data
-                                if r.get("status") == "Not Mentioned"
-                            ]
-
-                            if supports:
-                                st.success(
-                                    f"{len(supports)} claim(s) verified against sources"
-                                )
-                            if refutes:
-                                st.error(
-                                    f"{len(refutes)} claim(s) contradicted by sources"
-                                )
-                            if not_mentioned:
-                                st.warning(
-                                    f"{len(not_mentioned)} claim(s) extrapolated from sources"
-                                )
-                elif step_type == "final_answer":
-                    st.success(f"{title}")
-                    if details:
-                        st.caption(details)
+                    elif step_type == "verification_result":
+                        # Show verification details if available, counting
+                        # statuses in one pass
+                        status_counts: dict[str, int] = {}
+                        for r in step_info.get("verification_results", []):
+                            status = r.get("status")
+                            status_counts[status] = status_counts.get(status, 0) + 1
+
+                        if status_counts.get("Supports"):
+                            st.success(
+                                f"{status_counts['Supports']} claim(s) verified against sources"
+                            )
+                        if status_counts.get("Refutes"):
+                            st.error(
+                                f"{status_counts['Refutes']} claim(s) contradicted by sources"
+                            )
+                        if status_counts.get("Not Mentioned"):
+                            st.warning(
+                                f"{status_counts['Not Mentioned']} claim(s) extrapolated from sources"
+                            )
 
 
 def display_answer_with_verification(
@@ -1818,21 +1086,30 @@ def display_answer_with_verification(
     # Track which claims have been matched to avoid duplicate badges
     matched_claims = set()
 
+    # Precompute each claim's preview and significant words once, plus a
+    # word -> claim index so overlap is only scored for claims sharing a word
+    claim_entries = []
+    word_to_claims: dict[str, list[int]] = {}
+    for claim, claim_status in claim_to_status.items():
+        if claim and len(claim) > 15:
+            claim_preview = claim[:50].lower().strip()
+            claim_words = {w for w in claim_preview.split() if len(w) > 3}
+            for word in claim_words:
+                word_to_claims.setdefault(word, []).append(len(claim_entries))
+            claim_entries.append((claim, claim_status, claim_preview, claim_words))
+
     # Clean answer text (remove citations section for processing)
-    answer_only = (
-        answer_text.split("**References:**")[0].strip()
-        if "**References:**" in answer_text
-        else answer_text
-    )
+    answer_part, refs_sep, _ = answer_text.partition(_REFS_SENTINEL)
+    answer_only = answer_part.strip() if refs_sep else answer_text
 
     # Split answer into sentences and add verification markers
-    sentences = re.split(r"([.;]\s+|\n+)", answer_only)
+    sentences = _SENTENCE_SPLIT_RE.split(answer_only)
 
-    displayed_text = ""
+    displayed_parts = []
     for sentence in sentences:
         sentence_clean = sentence.strip()
         if not sentence_clean or len(sentence_clean) < 10:
-            displayed_text += sentence
+            displayed_parts.append(sentence)
             continue
 
         # Check if any claim matches this sentence (fuzzy match)
@@ -1840,57 +1117,60 @@ def display_answer_with_verification(
         status = None
         best_match = None
         best_match_score = 0
+        sentence_preview = sentence_clean[:100].lower().strip()
 
-        for claim, claim_status in claim_to_status.items():
-            if claim and len(claim) > 15 and claim not in matched_claims:
-                # Check if claim text appears in sentence (first 50 chars for matching)
-                claim_preview = claim[:50].lower().strip()
-                sentence_preview = sentence_clean[:100].lower().strip()
-
-                match_score = 0
-                # Check for substring match (exact match is best)
-                if claim_preview in sentence_preview:
-                    match_score = 100  # High score for substring match
+        # Substring match (first 50 chars of the claim) is best; the first wins
+        for claim, claim_status, claim_preview, _ in claim_entries:
+            if claim not in matched_claims and claim_preview in sentence_preview:
+                status = claim_status
+                best_match = claim
+                break
+        else:
+            # Otherwise score word overlap, keeping the earliest claim on ties.
+            # Count shared words per claim straight from the index; a match
+            # needs at least two, so short sentences skip the walk entirely
+            sentence_words = {w for w in sentence_preview.split() if len(w) > 3}
+            shared_counts: dict[int, int] = {}
+            if len(sentence_words) >= 2:
+                for word in sentence_words:
+                    for idx in word_to_claims.get(word, ()):
+                        shared_counts[idx] = shared_counts.get(idx, 0) + 1
+            for idx in sorted(shared_counts):
+                overlap = shared_counts[idx]
+                claim, claim_status, _, claim_words = claim_entries[idx]
+                if overlap < 2 or claim in matched_claims:
+                    continue
+                # More overlap = higher score
+                match_score = overlap / len(claim_words) * 50
+                if match_score > best_match_score:
                     status = claim_status
                     best_match = claim
                     best_match_score = match_score
-                    break  # Exact match, stop searching
-                # Check word overlap for longer claims
-                claim_words = set(w for w in claim_preview.split() if len(w) > 3)
-                sentence_words = set(w for w in sentence_preview.split() if len(w) > 3)
-                if claim_words and len(claim_words & sentence_words) >= 2:
-                    # Calculate overlap score (more overlap = higher score)
-                    overlap_score = (
-                        len(claim_words & sentence_words) / len(claim_words)
-                        if claim_words
-                        else 0
-                    )
-                    match_score = overlap_score * 50  # Medium score for word overlap
-                    if match_score > best_match_score:
-                        status = claim_status
-                        best_match = claim
-                        best_match_score = match_score
 
         # Only add badge if we found a match and it hasn't been used yet
         if best_match and best_match not in matched_claims:
             matched_claims.add(best_match)
             if status == "Supports":
                 # Add verified badge
-                displayed_text += f'{sentence}<span class="verification-badge verified">Verified</span>'
+                displayed_parts.append(
+                    f'{sentence}<span class="verification-badge verified">Verified</span>'
+                )
             elif status == "Refutes":
                 # Add refuted badge
-                displayed_text += (
+                displayed_parts.append(
                     f'{sentence}<span class="verification-badge refuted">Refuted</span>'
                 )
             elif status == "Not Mentioned":
                 # Add unverified badge
-                displayed_text += f'{sentence}<span class="verification-badge unverified">Extrapolated</span>'
+                displayed_parts.append(
+                    f'{sentence}<span class="verification-badge unverified">Extrapolated</span>'
+                )
             else:
-                displayed_text += sentence
+                displayed_parts.append(sentence)
         else:
-            displayed_text += sentence
+            displayed_parts.append(sentence)
 
-    st.markdown(displayed_text, unsafe_allow_html=True)
+    st.markdown("".join(displayed_parts), unsafe_allow_html=True)
 
     # Show verification summary in expander
     with st.expander("Verification Details", expanded=False):
@@ -1926,6 +1206,7 @@ def display_answer_with_verification(
         if verification_results:
             st.divider()
             st.caption("Individual Claims:")
+            claim_parts = []
             for i, result in enumerate(verification_results, 1):
                 claim = result.get("claim", "")  # Show full claim, no truncation
                 status = result.get("status", "Not Mentioned")
@@ -1950,7 +1231,49 @@ def display_answer_with_verification(
                     </div>
                 </div>
                 """
-                st.markdown(claim_html, unsafe_allow_html=True)
+                claim_parts.append(claim_html)
+            # One markdown element for all claims instead of one per claim
+            st.markdown("".join(claim_parts), unsafe_allow_html=True)
+
+
+def _stream_writer(
+    render: Callable[[str], None],
+    on_first_chunk: Callable[[], None] | None = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> Callable[[str], None]:
+    """Build a token callback that buffers streamed chunks and redraws sparingly.
+
+    Chunks are escaped once on arrival so a redraw is just a join. Newlines
+    become &#10; so blank lines can't end the HTML block and hand the rest to
+    the markdown parser; pre-wrap still breaks lines. A redraw happens at most
+    once per _STREAM_FLUSH_INTERVAL and only with at least _STREAM_FLUSH_CHARS
+    new characters pending; the final answer replaces the placeholder anyway.
+
+    Args:
+        render: Called with the escaped text received so far.
+        on_first_chunk: Optional hook run when the first chunk arrives.
+        clock: Monotonic time source.
+
+    Returns:
+        Callback accepting each generated chunk.
+    """
+    parts: list[str] = []
+    last_flush = clock()
+    pending = 0
+
+    def write(chunk: str) -> None:
+        nonlocal last_flush, pending
+        if not parts and on_first_chunk is not None:
+            on_first_chunk()
+        parts.append(html.escape(chunk).replace("\n", "&#10;"))
+        pending += len(chunk)
+        now = clock()
+        if now - last_flush < _STREAM_FLUSH_INTERVAL or pending < _STREAM_FLUSH_CHARS:
+            return
+        last_flush, pending = now, 0
+        render("".join(parts))
+
+    return write
 
 
 def chat_ui(
@@ -1972,121 +1295,65 @@ def chat_ui(
         # Show placeholder chat interface even without documents
         return
 
-    # Get document IDs for current session to filter search results
-    # Updated to handle new format: (doc_id, filename, source_uri, count, title, author)
-    session_doc_ids = []
-    for doc_info in st.session_state["ingested_docs"]:
-        if len(doc_info) >= 4:
-            session_doc_ids.append(doc_info[0])  # doc_id is first element
-
     # Display chat history with verification status and trajectory
     # Use cached rendering to avoid unnecessary recomputation
     messages = st.session_state.get("messages", [])
-    for idx, (role, content) in enumerate(messages):
+    # Only the most recent messages are rendered; older ones load on request
+    window_start = max(0, len(messages) - st.session_state["chat_window"])
+    if window_start and st.button(
+        f"Load earlier messages ({window_start} hidden)", key="load_earlier"
+    ):
+        st.session_state["chat_window"] += _CHAT_WINDOW
+        st.rerun()
+    # Index trajectories and verification results by answer text once, instead
+    # of scanning both lists for every rendered message (first entry wins)
+    traj_by_answer = {}
+    for traj_entry in st.session_state.get("agent_trajectory", []):
+        if traj_entry.get("answer") and traj_entry.get("trajectory"):
+            traj_by_answer.setdefault(traj_entry["answer"].rstrip(), traj_entry)
+    verif_by_answer = {}
+    for verif in st.session_state.get("verification_results", []):
+        verif_by_answer.setdefault(verif.get("answer"), verif)
+
+    for idx, (role, content) in enumerate(messages[window_start:], window_start):
         with st.chat_message(role):
             if role == "assistant":
                 # Extract answer and sources from content first
-                answer_only = (
-                    content.split("**References:**")[0].strip()
-                    if "**References:**" in content
-                    else content
-                )
+                answer_part, refs_sep, refs_text = content.partition(_REFS_SENTINEL)
+                answer_only = answer_part.strip() if refs_sep else content
+                refs_text = refs_text.strip()
 
-                # Extract sources from content
-                sources = []
-                if "**References:**" in content:
-                    refs_text = content.split("**References:**", 1)[1].strip()
-                    # Extract sources from reference list (handles both bullet points and numbered lists)
-                    import re
-
-                    # Match s3:// URIs, handling both "- s3://..." and "1. s3://..." formats
-                    sources = re.findall(r"s3://[^\s\n]+", refs_text)
-                    sources = [
-                        s.rstrip("-").strip().lstrip("0123456789. ").strip()
-                        for s in sources
-                    ]
-                    sources = [
-                        s for s in sources if s.startswith("s3://")
-                    ]  # Filter to only valid URIs
-
-                # Check for trajectory first
+                # Check for trajectory first (content is the raw answer plus
+                # an optional references block)
                 trajectory_shown = False
-                if st.session_state.get("agent_trajectory"):
-                    # Find trajectory for this message (match by answer content)
-                    for traj_entry in st.session_state["agent_trajectory"]:
-                        # Try to match by checking if the answer is in the content
-                        if traj_entry.get("answer") and traj_entry["answer"] in content:
-                            trajectory_data = traj_entry.get("trajectory")
-                            if trajectory_data:
-                                display_agent_trajectory(
-                                    traj_entry.get("query", ""), trajectory_data
-                                )
-                                trajectory_shown = True
-                                break
+                traj_entry = traj_by_answer.get(
+                    (answer_part if refs_sep else content).rstrip()
+                )
+                if traj_entry:
+                    display_agent_trajectory(
+                        traj_entry.get("query", ""), traj_entry["trajectory"]
+                    )
+                    trajectory_shown = True
 
                 # Check if verification results are available
                 verification_results = []
-                if "verification_results" in st.session_state:
-                    verification_data = st.session_state["verification_results"]
-                    for verif in verification_data:
-                        if verif.get("answer") == answer_only:
-                            verification_results = verif.get("verification", [])
-                            # Use sources from verification if available, otherwise keep extracted sources
-                            sources = verif.get("sources", sources)
-                            break
+                verif = verif_by_answer.get(answer_only)
+                if verif:
+                    verification_results = verif.get("verification", [])
 
                 if verification_results:
                     display_answer_with_verification(answer_only, verification_results)
                     # Show references separately if they exist
-                    if "**References:**" in content:
+                    if refs_sep:
                         # Extract and format references with titles
-                        refs_text = content.split("**References:**", 1)[1].strip()
-                        import re
-
-                        # Match s3:// URIs
-                        source_uris = re.findall(r"s3://[^\s\n]+", refs_text)
-                        source_uris = [
-                            s.rstrip("-").strip().lstrip("0123456789. ").strip()
-                            for s in source_uris
-                        ]
-                        source_uris = [s for s in source_uris if s.startswith("s3://")]
+                        source_uris = _extract_sources(refs_text)
 
                         if source_uris:
-                            st.markdown("\n\n**References:**")
-                            ingested_docs = st.session_state.get("ingested_docs", [])
-                            for source_uri in source_uris:
-                                # Find document info by source_uri
-                                doc_title = None
-                                for doc_info in ingested_docs:
-                                    if len(doc_info) >= 3 and doc_info[2] == source_uri:
-                                        # Get title if available (position 4)
-                                        if len(doc_info) >= 5:
-                                            doc_title = doc_info[4]
-                                        break
-
-                                # Create display text with title only (authors only used for bibliography)
-                                if doc_title:
-                                    display_text = f"- **{doc_title}**"
-                                else:
-                                    # Fallback to filename if no title
-                                    for doc_info in ingested_docs:
-                                        if (
-                                            len(doc_info) >= 3
-                                            and doc_info[2] == source_uri
-                                        ):
-                                            doc_filename = (
-                                                doc_info[1]
-                                                if len(doc_info) >= 2
-                                                else None
-                                            )
-                                            display_text = (
-                                                f"- **{doc_filename or 'Document'}**"
-                                            )
-                                            break
-                                    else:
-                                        display_text = f"- **{source_uri.split('/')[-1] or 'Document'}**"
-
-                                st.markdown(display_text)
+                            # Titles come from the session's cached URI index
+                            st.markdown(
+                                "\n\n**References:**\n"
+                                + format_references_with_titles(source_uris)
+                            )
                         else:
                             # Fallback to original display
                             st.markdown(f"\n\n**References:**\n{refs_text}")
@@ -2094,9 +1361,10 @@ def chat_ui(
                 elif not trajectory_shown:
                     st.markdown(content)
 
-                # Add "Add to Report" button inside chat message context
-                # Use sources extracted above
-                sources_final = sources
+                # Add "Add to Report" button inside chat message context; the
+                # report key uses the sources stored with the message, the
+                # same list _clean_report_flags() keys on
+                sources_final = _message_sources(idx)
 
                 # Extract query from previous user message
                 query_text = ""
@@ -2105,8 +1373,17 @@ def chat_ui(
 
                 # Place button inside the chat message, after content
                 button_key = f"add_report_{idx}"
-                # Use a stable key based on answer content hash
-                answer_hash = hash((answer_only, str(sorted(sources_final))))
+                # Use a stable key based on answer content hash, plus the first
+                # 100 chars of the answer used to spot it in the report text;
+                # messages is append-only, so both are computed once per message
+                answer_meta = st.session_state.setdefault("_answer_meta", {})
+                cached = answer_meta.get(idx)
+                if cached is None:
+                    cached = answer_meta[idx] = (
+                        _answer_key(answer_only, sources_final),
+                        answer_only[:100].strip(),
+                    )
+                answer_hash, answer_snippet = cached
                 report_key = f"_report_item_{answer_hash}"
 
                 # Check flag first (more reliable than text search)
@@ -2114,17 +1391,11 @@ def chat_ui(
 
                 # Check if answer is already in the report text
                 report_text = st.session_state.get("report_text", "")
-                # Use first 100 chars of answer to check if it's in report (more reliable than full text)
-                answer_snippet = (
-                    answer_only[:100].strip()
-                    if len(answer_only) > 100
-                    else answer_only.strip()
-                )
                 is_in_text = answer_snippet in report_text if answer_snippet else False
 
                 # If flag is set but answer is not in text, clear the flag (user deleted it)
                 if is_flagged and not is_in_text:
-                    st.session_state.pop(report_key, None)
+                    _clear_report_flag(report_key)
                     is_flagged = False
 
                 is_already_added = is_flagged or is_in_text
@@ -2147,7 +1418,7 @@ def chat_ui(
 
                     if button_clicked:
                         # Set flag first to prevent duplicate clicks
-                        st.session_state[report_key] = True
+                        _set_report_flag(report_key)
                         # Add to report immediately
                         add_to_report(answer_only, sources_final, query_text)
                         # Rerun to update button state
@@ -2182,86 +1453,95 @@ def chat_ui(
             # Store status callback in session state so orchestrator/pipeline can use it
             st.session_state["_status_callback"] = update_status
 
-            # Start with initial status
-            update_status("Searching documents and generating answer...")
+            # Streaming fast path: show raw escaped text while tokens arrive and
+            # only render markdown once the final answer is available
+            stream_container = st.empty()
 
-            # Filter search to only use documents from current session
-            answer, sources = query_pipeline.answer(
-                user_input, allowed_doc_ids=session_doc_ids
-            )
+            def reset_stream() -> None:
+                """Clear streamed text and register a fresh token callback."""
+                stream_container.empty()
+                st.session_state["_token_callback"] = _stream_writer(
+                    lambda body: stream_container.markdown(
+                        f'<div class="streaming-raw">{body}</div>',
+                        unsafe_allow_html=True,
+                    ),
+                    on_first_chunk=status_container.empty,
+                )
 
-            # Clear status and callback after processing
-            status_container.empty()
-            if "_status_callback" in st.session_state:
-                del st.session_state["_status_callback"]
+            # The pipeline calls _token_reset before retrying with standard
+            # RAG, so a failed orchestrator answer is not streamed twice
+            reset_stream()
+            st.session_state["_token_reset"] = reset_stream
 
-                # Get trajectory if available (check after answer is generated)
-                if st.session_state.get("agent_trajectory"):
-                    # Get the latest trajectory
-                    latest_traj = st.session_state["agent_trajectory"][-1]
-                    if latest_traj.get("query") == user_input:
-                        trajectory_data = latest_traj.get("trajectory")
+            try:
+                # Start with initial status
+                update_status("Searching documents and generating answer...")
+
+                # Filter search to only use documents from current session;
+                # only needed when a question is asked, not on every rerun.
+                # Each ingested_docs entry starts with the doc id, followed
+                # by the filename, source URI, chunk count, title and author
+                session_doc_ids = [
+                    doc_info[0]
+                    for doc_info in st.session_state["ingested_docs"]
+                    if len(doc_info) >= 4
+                ]
+                answer, sources = query_pipeline.answer(
+                    user_input, allowed_doc_ids=session_doc_ids
+                )
+            finally:
+                # Clear status, streamed text and callbacks after processing,
+                # also when answering fails, so later runs neither stream
+                # into a stale placeholder nor look busy
+                status_container.empty()
+                stream_container.empty()
+                st.session_state.pop("_token_callback", None)
+                st.session_state.pop("_token_reset", None)
+                st.session_state.pop("_status_callback", None)
+
+            # Get the latest trajectory if available (check after answer is generated)
+            traj_list = st.session_state.get("agent_trajectory")
+            latest_traj = traj_list[-1] if traj_list else None
+            if latest_traj and latest_traj.get("query") == user_input:
+                trajectory_data = latest_traj.get("trajectory")
 
             # Show trajectory if available (display before answer)
             if trajectory_data:
                 display_agent_trajectory(user_input, trajectory_data)
 
-            # Get verification results if available
-            verification_results = []
-            if st.session_state.get("verification_results"):
-                # Get the latest verification result
-                latest_verif = st.session_state["verification_results"][-1]
-                if latest_verif.get("answer") == answer:
-                    verification_results = latest_verif.get("verification", [])
+            # Get the latest verification results if available
+            verif_list = st.session_state.get("verification_results")
+            latest_verif = verif_list[-1] if verif_list else None
+            verification_results = (
+                latest_verif.get("verification", [])
+                if latest_verif and latest_verif.get("answer") == answer
+                else []
+            )
 
             # Display answer with verification
             display_answer_with_verification(answer, verification_results)
 
             # Append citations separately with titles only
             if sources:
-                # Display references with titles only (authors only used for bibliography)
-                st.markdown("\n\n**References:**")
-                refs_list = []
-                ingested_docs = st.session_state.get("ingested_docs", [])
-
-                for source_uri in sources:
-                    # Find document info by source_uri
-                    doc_title = None
-                    for doc_info in ingested_docs:
-                        if len(doc_info) >= 3 and doc_info[2] == source_uri:
-                            # Get title if available (position 4), fallback to filename
-                            if len(doc_info) >= 5:
-                                doc_title = doc_info[4]
-                            break
-
-                    # Create display text with title only
-                    if doc_title:
-                        display_text = f"- **{doc_title}**"
-                    else:
-                        # Fallback to filename if no title
-                        for doc_info in ingested_docs:
-                            if len(doc_info) >= 3 and doc_info[2] == source_uri:
-                                doc_filename = (
-                                    doc_info[1] if len(doc_info) >= 2 else None
-                                )
-                                display_text = f"- **{doc_filename or 'Document'}**"
-                                break
-                        else:
-                            display_text = (
-                                f"- **{source_uri.split('/')[-1] or 'Document'}**"
-                            )
-
-                    st.markdown(display_text)
-                    refs_list.append(display_text)
-
-                citations = "\n\n**References:**\n" + "\n".join(refs_list)
+                # Titles come from the session's cached URI index (authors
+                # are only used for the bibliography)
+                citations = "\n\n**References:**\n" + format_references_with_titles(
+                    sources
+                )
+                st.markdown(citations)
                 full_response = answer + citations
             else:
                 full_response = answer
 
+            # Store the sources under the index this answer will take in
+            # messages, so its report key is rebuilt from the same list in
+            # later reruns and when stale report flags are cleaned
+            msg_idx = len(st.session_state["messages"])
+            st.session_state.setdefault("_message_sources", {})[msg_idx] = sources
+
             # Add "Add to Report" button inside chat message context
             # Use a stable key based on answer content hash
-            answer_hash = hash((answer, str(sorted(sources))))
+            answer_hash = _answer_key(answer, _message_sources(msg_idx))
             report_key = f"_report_new_{answer_hash}"
 
             # Check flag first (more reliable than text search)
@@ -2277,7 +1557,7 @@ def chat_ui(
 
             # If flag is set but answer is not in text, clear the flag (user deleted it)
             if is_flagged and not is_in_text:
-                st.session_state.pop(report_key, None)
+                _clear_report_flag(report_key)
                 is_flagged = False
 
             is_already_added = is_flagged or is_in_text
@@ -2300,7 +1580,7 @@ def chat_ui(
 
                 if button_clicked:
                     # Set flag first to prevent duplicate clicks
-                    st.session_state[report_key] = True
+                    _set_report_flag(report_key)
                     # Add to report immediately
                     add_to_report(answer, sources, user_input)
                     # Rerun to update button state
@@ -2322,14 +1602,7 @@ def research_assistant_page(
     st.caption("AI Research Analyst • Verifiable Synthesis • Powered by watsonx.ai")
 
     # Disclaimer under title
-    st.markdown(
-        '<p style="font-size: 0.85rem; color: var(--secondary-text); opacity: 0.6; margin-top: -0.8rem; margin-bottom: 1rem;">'
-        "While MedCortex strives for accuracy through verification and source attribution, "
-        "AI-generated content may contain errors. Please review all information and verify "
-        "critical findings against original sources."
-        "</p>",
-        unsafe_allow_html=True,
-    )
+    st.html(_DISCLAIMER_HTML)
 
     # Upload section in main area (can be hidden)
     upload_section(ingestion)
@@ -2349,14 +1622,11 @@ def research_report_page() -> None:
     report_page()
 
 
-def about_page() -> None:
-    """Display the About page.
-
-    Shows information about MedCortex, its mission, and features.
-    """
-    st.title("About MedCortex")
-
-    st.markdown("""
+# About page sections as (header, markdown body); header None means no heading
+_ABOUT_SECTIONS: tuple[tuple[str | None, str], ...] = (
+    (
+        None,
+        """
     MedCortex was built to solve the single biggest challenge in modern medical research: **the synthesis headache**. 
     Researchers, clinicians, and academics are overwhelmed by the sheer volume of literature. Finding information is hard, 
     but synthesizing it—connecting data, comparing findings, and building a trusted evidence base—is a slow, manual, 
@@ -2364,11 +1634,11 @@ def about_page() -> None:
     
     Standard AI tools promise speed but lack the required rigor. A "black box" answer is useless in a field that runs on 
     evidence. Hallucinations aren't just errors; they're a risk.
-    """)
-
-    st.header("Our Solution: An Analyst, Not a Search Bar")
-
-    st.markdown("""
+    """,
+    ),
+    (
+        "Our Solution: An Analyst, Not a Search Bar",
+        """
     MedCortex is **not a search engine**. It's an **AI research analyst**.
     
     Based on a state-of-the-art agentic framework and powered by IBM watsonx.ai, MedCortex performs the real work of 
@@ -2378,35 +1648,37 @@ def about_page() -> None:
     
     It intelligently routes your query to the right tool, performing advanced **Hybrid Search** for textual concepts and 
     separate, structured-data analysis for information locked in tables (**TableRAG**).
-    """)
-
-    st.header("The Core of MedCortex: Trust Through Verification")
-
-    st.markdown("""
+    """,
+    ),
+    (
+        "The Core of MedCortex: Trust Through Verification",
+        """
     Our **"Analysis Breakdown"** creates transparency. Our **"Verification Engine"** builds trust. MedCortex is a **"glass box."**
     
     After generating an answer, the platform performs a crucial third step: it fact-checks every single claim against its 
     source documents. Findings are clearly marked in the chat with a **"VERIFIED"** tag. If a claim is an AI-generated summary 
     that cannot be directly supported by the text, it is explicitly labeled as **"REFUTED,"** giving you full control and 
     transparency.
-    """)
-
-    st.header("From Analysis to Deliverable")
-
-    st.markdown("""
+    """,
+    ),
+    (
+        "From Analysis to Deliverable",
+        """
     MedCortex is designed to fit your professional workflow, from initial **"Objectives"** to final **"Deliverables"**. 
     As you gather verified insights from the Analyst Chat, you can add them to your **"Synthesis Studio."** This curated 
     workspace is where your analysis becomes a formatted research report, complete with citations. You can then export your 
     work as a `.docx` or Markdown file, turning days of manual writing into minutes of curation.
-    """)
-
-    st.markdown("""
+    """,
+    ),
+    (
+        None,
+        """
     ### This is MedCortex: Your AI Research Analyst for verifiable, end-to-end synthesis.
-    """)
+    """,
+    ),
+)
 
-    st.title("About the Creator")
-
-    st.markdown("""
+_ABOUT_CREATOR = """
     MedCortex is built by **Rohan Ramakrishnan**, a student at the University of Southern California (USC) pursuing a unique, interdisciplinary 
     blend of Computer Science and Business Administration.
     
@@ -2424,7 +1696,24 @@ def about_page() -> None:
     
     When not in front of a keyboard, he is an avid Formula 1 enthusiast, appreciating the blend of high-performance 
     engineering, data analytics, and mission-driven teamwork that defines the sport.
-    """)
+    """
+
+
+def about_page() -> None:
+    """Display the About page.
+
+    Shows information about MedCortex, its mission, and features.
+    """
+    st.title("About MedCortex")
+
+    for header, body in _ABOUT_SECTIONS:
+        if header:
+            st.header(header)
+        st.markdown(body)
+
+    st.title("About the Creator")
+
+    st.markdown(_ABOUT_CREATOR)
 
 
 def research_about_page() -> None:
@@ -2440,7 +1729,7 @@ def research_about_page() -> None:
     about_page()
 
 
-@st.cache_resource
+@functools.lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Load and cache application settings.
 
@@ -2463,9 +1752,26 @@ def get_pipelines(
     Returns:
         Tuple of (IngestionPipeline, QueryPipeline) instances.
     """
+    # Imported here so the RAG stack loads on first use, not on every import.
+    from app.rag.pipeline import IngestionPipeline, QueryPipeline
+
     return IngestionPipeline(settings), QueryPipeline(settings)
 
 
+def _navigate(page: str) -> None:
+    """Switch to a page, touching the URL and rerunning only on a real change.
+
+    Args:
+        page: Page identifier ("assistant", "report" or "about").
+    """
+    if st.session_state.get("current_page") == page:
+        return
+    st.session_state["current_page"] = page
+    with contextlib.suppress(Exception):
+        st.query_params["page"] = page
+    st.rerun()
+
+
 def main() -> None:
     """Main entry point for the Streamlit application.
 
@@ -2487,27 +1793,18 @@ def main() -> None:
     # Inject custom CSS for medical research UI (optimized)
     inject_custom_css()
 
-    # Get pipelines (cached)
-    ingestion, query_pipeline = get_pipelines(settings)
-
-    # Initialize navigation state
-    if "current_page" not in st.session_state:
-        st.session_state["current_page"] = "assistant"
-
     # Navigation in sidebar - separate pages
     st.sidebar.markdown("### Navigation")
 
-    # Get current page from query params or session state
+    # Get current page from query params, falling back to session state
+    current_page = st.session_state["current_page"]
     try:
         query_params = st.query_params
         if "page" in query_params:
-            current_page = query_params["page"]
-            st.session_state["current_page"] = current_page
-        else:
-            current_page = st.session_state.get("current_page", "assistant")
-    except:
-        # Fallback if query_params not available
-        current_page = st.session_state.get("current_page", "assistant")
+            current_page = st.session_state["current_page"] = query_params["page"]
+    except Exception:
+        # query_params not available; keep the session's page
+        pass
 
     # Check if answer generation is in progress
     is_generating = "_status_callback" in st.session_state
@@ -2540,35 +1837,19 @@ def main() -> None:
         st.sidebar.caption("⚠️ Answer generation in progress...")
 
     # Handle navigation - only rerun if page actually changes and not during generation
-    if nav_assistant and not is_generating:
-        if st.session_state.get("current_page") != "assistant":
-            st.session_state["current_page"] = "assistant"
-            try:
-                st.query_params.page = "assistant"
-            except:
-                pass
-            st.rerun()
-
-    if nav_report and not is_generating:
-        if st.session_state.get("current_page") != "report":
-            st.session_state["current_page"] = "report"
-            try:
-                st.query_params.page = "report"
-            except:
-                pass
-            st.rerun()
-
-    if nav_about and not is_generating:
-        if st.session_state.get("current_page") != "about":
-            st.session_state["current_page"] = "about"
-            try:
-                st.query_params.page = "about"
-            except:
-                pass
-            st.rerun()
+    if not is_generating:
+        if nav_assistant:
+            _navigate("assistant")
+        elif nav_report:
+            _navigate("report")
+        elif nav_about:
+            _navigate("about")
 
     # Display content based on selected page - completely separate pages
     if current_page == "assistant":
+        # Pipelines (cached) are only needed here; building them after the
+        # sidebar lets navigation render first and keeps other pages light
+        ingestion, query_pipeline = get_pipelines(settings)
         research_assistant_page(ingestion, query_pipeline)
     elif current_page == "report":
         research_report_page()
@@ -9,7 +9,7 @@ class EmbeddingClient:
         self.settings = settings
         credentials = Credentials(
             api_key=settings.ibm_cloud_api_key,
-            url=f"https://{settings.watsonx_region}.ml.cloud.ibm.com",
+            url=settings.watsonx_url,
         )
         self.client = WXEmbeddings(
             model_id=settings.watsonx_embed_model,
@@ -1,3 +1,4 @@
+from collections.abc import Callable
 import re
 
 from ibm_watsonx_ai import Credentials
@@ -30,7 +31,7 @@ class GeneratorClient:
         self.settings = settings
         credentials = Credentials(
             api_key=settings.ibm_cloud_api_key,
-            url=f"https://{settings.watsonx_region}.ml.cloud.ibm.com",
+            url=settings.watsonx_url,
         )
         self.client = ModelInference(
             model_id=settings.watsonx_gen_model,
@@ -184,8 +185,73 @@ class GeneratorClient:
 
         return cleaned
 
+    def _stream_text(
+        self,
+        prompt: str,
+        params: dict,
+        on_token: Callable[[str], None] | None = None,
+    ) -> str:
+        """Stream a completion, forwarding cleaned text to on_token.
+
+        Raw chunks are not forwarded: clean_output() drops an echoed prompt,
+        a trailing "Sources:" block or a meta paragraph only once enough of
+        it has arrived, so they would flash on screen first. Instead the
+        text is cleaned up to the last paragraph break each time a new break
+        arrives, and again once the stream ends, and on_token receives the
+        cleaned text added since the previous call. If cleaning changes text
+        that was already forwarded (e.g. a later "Answer:" label), nothing
+        more is forwarded and the caller's final render replaces it.
+
+        Args:
+            prompt: Prompt text.
+            params: Generation parameters.
+            on_token: Optional callback for cleaned text as it arrives.
+
+        Returns:
+            The raw completion text, stripped.
+        """
+        text_parts: list[str] = []
+        sent: str | None = ""
+        for chunk in self.client.generate_text_stream(prompt=prompt, params=params):
+            prev = text_parts[-1][-1:] if text_parts else ""
+            text_parts.append(str(chunk))
+            if on_token is None or sent is None or "\n\n" not in prev + text_parts[-1]:
+                continue
+            raw = "".join(text_parts)
+            sent = self._forward_cleaned(raw[: raw.rfind("\n\n") + 2], sent, on_token)
+        raw_answer = "".join(text_parts).strip()
+        if on_token is not None and sent is not None:
+            self._forward_cleaned(raw_answer, sent, on_token)
+        return raw_answer
+
+    def _forward_cleaned(
+        self, raw: str, sent: str, on_token: Callable[[str], None]
+    ) -> str | None:
+        """Send on_token the part of clean_output(raw) not sent yet.
+
+        Args:
+            raw: Raw text received so far, ending at a paragraph break or
+                at the end of the stream.
+            sent: Cleaned text already forwarded.
+            on_token: Callback receiving the new text.
+
+        Returns:
+            The cleaned text forwarded so far, or None if cleaning rewrote
+            text that was already sent.
+        """
+        cleaned = self.clean_output(raw)
+        if not cleaned.startswith(sent):
+            return None
+        if len(cleaned) > len(sent):
+            on_token(cleaned[len(sent) :])
+        return cleaned
+
     def generate(
-        self, question: str, contexts: list[str], temperature: float = 0.2
+        self,
+        question: str,
+        contexts: list[str],
+        temperature: float = 0.2,
+        on_token: Callable[[str], None] | None = None,
     ) -> str:
         prompt = self.build_prompt(question, contexts)
         params = {
@@ -198,11 +264,7 @@ class GeneratorClient:
         # Prefer official streaming API if available
         raw_answer = ""
         try:
-            stream_resp = self.client.generate_text_stream(prompt=prompt, params=params)
-            text_parts: list[str] = []
-            for chunk in stream_resp:  # type: ignore[assignment]
-                text_parts.append(str(chunk))
-            raw_answer = "".join(text_parts).strip()
+            raw_answer = self._stream_text(prompt, params, on_token)
         except Exception:
             # streaming not supported or failed; fall back below
             pass
@@ -230,12 +292,18 @@ class GeneratorClient:
         # Clean the output to remove prompt artifacts
         return self.clean_output(raw_answer)
 
-    def generate_from_prompt(self, prompt: str, temperature: float = 0.2) -> str:
+    def generate_from_prompt(
+        self,
+        prompt: str,
+        temperature: float = 0.2,
+        on_token: Callable[[str], None] | None = None,
+    ) -> str:
         """
         Generate text directly from a raw prompt string.
 
         Useful for special cases like query decomposition, synthesis, etc.
-        that need custom prompt formatting.
+        that need custom prompt formatting. on_token, if given, receives the
+        cleaned answer text as it streams in (see _stream_text).
         """
         params = {
             GenParams.TEMPERATURE: float(temperature),
@@ -246,11 +314,7 @@ class GeneratorClient:
 
         raw_answer = ""
         try:
-            stream_resp = self.client.generate_text_stream(prompt=prompt, params=params)
-            text_parts: list[str] = []
-            for chunk in stream_resp:
-                text_parts.append(str(chunk))
-            raw_answer = "".join(text_parts).strip()
+            raw_answer = self._stream_text(prompt, params, on_token)
         except Exception:
             pass
 
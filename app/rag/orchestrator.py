@@ -210,6 +210,7 @@ Only return the JSON list, nothing else:"""
         allowed_doc_ids: list[str] | None = None,
         show_trajectory: bool = True,
         status_callback: Callable[[str], None] | None = None,
+        token_callback: Callable[[str], None] | None = None,
     ) -> tuple[str, list[str], list[dict] | None]:
         """Answer query using iterative decomposition and retrieval.
 
@@ -219,6 +220,8 @@ Only return the JSON list, nothing else:"""
             show_trajectory: Whether to collect trajectory information.
             status_callback: Optional callback function(status_text) to update
                 UI status.
+            token_callback: Optional callback receiving chunks of the final
+                synthesized answer as they are generated.
 
         Returns:
             Tuple of (final_answer, source_uris, trajectory_info) where
@@ -320,6 +323,7 @@ Only return the JSON list, nothing else:"""
                     sub_question,
                     allowed_doc_ids=allowed_doc_ids,
                     use_orchestrator=False,  # Prevent recursion
+                    stream=False,  # Only the final synthesis is streamed
                 )
                 # Get source chunks from retrieval (need to access them from query pipeline)
                 # We'll collect chunks from the retrieval step
@@ -403,7 +407,9 @@ Synthesized Answer:"""
 
         try:
             final_answer = self.gen.generate_from_prompt(
-                prompt=synthesis_prompt, temperature=self.settings.temperature
+                prompt=synthesis_prompt,
+                temperature=self.settings.temperature,
+                on_token=token_callback,
             )
 
             # Verify the final synthesized answer against source chunks
@@ -15,6 +15,18 @@ except ImportError:
     PDFPLUMBER_AVAILABLE = False
     logger.warning("pdfplumber not available, falling back to pypdf-based extraction")
 
+# Patterns used by the title/author heuristics, which run once per text line.
+_DATE_ONLY_RE = re.compile(r"^\d{4}$|^[A-Za-z]+\s+\d{4}$")
+_URL_OR_EMAIL_RE = re.compile(r"http://|https://|www\.|@")
+_SPECIAL_CHAR_RE = re.compile(r"[^\w\s]")
+_NON_WORD_RE = re.compile(r"[^\w]")
+_ASCII_LETTER_RE = re.compile(r"[a-zA-Z]")
+_ASCII_UPPER_RE = re.compile(r"[A-Z]")
+_NO_LETTERS_RE = re.compile(r"^[\d\s\W]+$")
+_PARENTHETICAL_RE = re.compile(r"\([^)]*\)")
+_BRACKETED_RE = re.compile(r"\[[^\]]*\]")
+_AUTHOR_AND_RE = re.compile(r"\s+and\s+", re.IGNORECASE)
+
 
 def extract_text_per_page(fileobj: BinaryIO) -> list[str]:
     reader = PdfReader(fileobj)
@@ -75,11 +87,11 @@ def _is_non_title_pattern(text: str) -> bool:
             return True
 
     # Check if it's just a date (e.g., "2024", "January 2024")
-    if re.match(r"^\d{4}$|^[A-Za-z]+\s+\d{4}$", text_lower):
+    if _DATE_ONLY_RE.match(text_lower):
         return True
 
     # Check if it's a URL or email
-    if re.search(r"http://|https://|www\.|@", text):
+    if _URL_OR_EMAIL_RE.search(text):
         return True
 
     # Check if it's too short (likely not a title)
@@ -91,7 +103,7 @@ def _is_non_title_pattern(text: str) -> bool:
         return True
 
     # Check if it has too many special characters (likely not a title)
-    special_char_count = len(re.findall(r"[^\w\s]", text))
+    special_char_count = len(_SPECIAL_CHAR_RE.findall(text))
     if special_char_count > len(text) * 0.3:  # More than 30% special chars
         return True
 
@@ -129,7 +141,7 @@ def _is_title_case(text: str) -> bool:
 
     for word in words:
         # Remove punctuation for checking
-        word_clean = re.sub(r"[^\w]", "", word)
+        word_clean = _NON_WORD_RE.sub("", word)
         if not word_clean:
             continue
 
@@ -148,7 +160,7 @@ def _is_title_case(text: str) -> bool:
 def _is_all_caps(text: str) -> bool:
     """Check if text is all uppercase (common for titles)."""
     # Remove punctuation and check
-    text_clean = re.sub(r"[^\w\s]", "", text)
+    text_clean = _SPECIAL_CHAR_RE.sub("", text)
     if not text_clean:
         return False
 
@@ -398,11 +410,11 @@ def _is_non_author_pattern(text: str) -> bool:
             return True
 
     # Check if it's just a date (e.g., "2024", "January 2024")
-    if re.match(r"^\d{4}$|^[A-Za-z]+\s+\d{4}$", text_lower):
+    if _DATE_ONLY_RE.match(text_lower):
         return True
 
     # Check if it's a URL or email
-    if re.search(r"http://|https://|www\.|@", text):
+    if _URL_OR_EMAIL_RE.search(text):
         return True
 
     # Check if it's too short (likely not a name)
@@ -414,7 +426,7 @@ def _is_non_author_pattern(text: str) -> bool:
         return True
 
     # Check if it has too many special characters (likely not a name)
-    special_char_count = len(re.findall(r"[^\w\s]", text))
+    special_char_count = len(_SPECIAL_CHAR_RE.findall(text))
     if special_char_count > len(text) * 0.3:  # More than 30% special chars
         return True
 
@@ -431,7 +443,7 @@ def _is_author_name(text: str) -> bool:
         return False
 
     # Check if it contains letters
-    if not re.search(r"[a-zA-Z]", text):
+    if not _ASCII_LETTER_RE.search(text):
         return False
 
     # Check if it has reasonable word count (typically 2-10 words for author names)
@@ -440,11 +452,11 @@ def _is_author_name(text: str) -> bool:
         return False
 
     # Check if it has capital letters (names typically have capitals)
-    if not re.search(r"[A-Z]", text):
+    if not _ASCII_UPPER_RE.search(text):
         return False
 
     # Check if it doesn't contain only numbers or symbols
-    if re.match(r"^[\d\s\W]+$", text):
+    if _NO_LETTERS_RE.match(text):
         return False
 
     return True
@@ -453,8 +465,8 @@ def _is_author_name(text: str) -> bool:
 def _extract_multiple_authors(text: str) -> str:
     """Extract and format multiple authors from text."""
     # Remove parentheticals (affiliations, emails, etc.)
-    text = re.sub(r"\([^)]*\)", "", text)
-    text = re.sub(r"\[[^\]]*\]", "", text)
+    text = _PARENTHETICAL_RE.sub("", text)
+    text = _BRACKETED_RE.sub("", text)
 
     # Handle "et al." patterns
     if "et al" in text.lower():
@@ -472,7 +484,7 @@ def _extract_multiple_authors(text: str) -> str:
                 authors.append(part)
     # Try "and" separation
     elif " and " in text.lower():
-        parts = re.split(r"\s+and\s+", text, flags=re.IGNORECASE)
+        parts = _AUTHOR_AND_RE.split(text)
         for part in parts:
             part = part.strip()
             if _is_author_name(part):
@@ -676,10 +688,9 @@ def _extract_author_by_position(
             # Validate if it looks like an author name
             if has_author_pattern or _is_author_name(author_text):
                 # Clean up the text
-                author_text = re.sub(
-                    r"\([^)]*\)", "", author_text
-                )  # Remove parentheticals
-                author_text = re.sub(r"\[[^\]]*\]", "", author_text)  # Remove brackets
+                # Remove parentheticals and brackets
+                author_text = _PARENTHETICAL_RE.sub("", author_text)
+                author_text = _BRACKETED_RE.sub("", author_text)
                 author_text = author_text.strip()
 
                 if _is_author_name(author_text):
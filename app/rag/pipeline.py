@@ -4,9 +4,12 @@ This module provides the IngestionPipeline and QueryPipeline classes
 for document processing and query answering.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 import io
 import logging
-import uuid
+import secrets
+from typing import Any, BinaryIO
 
 from ibm_watsonx_ai.wml_client_error import ApiRequestFailure
 
@@ -31,6 +34,23 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Runs query embeddings while BM25 scores on the script thread. Shared by all
+# sessions so a query does not start and join a thread of its own; a few
+# workers keep concurrent sessions from queueing behind each other.
+_EMBED_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="query-embed")
+
+
+@dataclass(slots=True)
+class PreparedDocument:
+    """A parsed and embedded PDF that has not been indexed yet."""
+
+    doc_id: str
+    source_uri: str
+    metadata: dict[str, str | None]
+    dataframes: list[Any] = field(default_factory=list)
+    chunks: list[str] = field(default_factory=list)
+    embeddings: list[list[float]] = field(default_factory=list)
+
 
 class IngestionPipeline:
     """Pipeline for ingesting and indexing documents.
@@ -208,7 +228,11 @@ class IngestionPipeline:
         return [], []
 
     def ingest_pdf(
-        self, doc_id: str, filename: str, source_uri: str
+        self,
+        doc_id: str,
+        filename: str,
+        source_uri: str,
+        file_obj: BinaryIO | None = None,
     ) -> tuple[int, dict[str, str | None]]:
         """Ingest a PDF document into the knowledge base.
 
@@ -216,24 +240,53 @@ class IngestionPipeline:
             doc_id: Document identifier.
             filename: Name of the PDF file.
             source_uri: S3 URI of the source document.
+            file_obj: Optional seekable file object with the PDF contents.
+                When given it is read directly instead of downloading the
+                document back from COS.
 
         Returns:
             Tuple of (upserted_count, metadata_dict) where metadata_dict
             contains title and author if available.
         """
-        file_stream = self._fetch_cos_stream(source_uri)
+        prepared = self.prepare_pdf(doc_id, filename, source_uri, file_obj)
+        return self.index_document(prepared)
+
+    def prepare_pdf(
+        self,
+        doc_id: str,
+        filename: str,
+        source_uri: str,
+        file_obj: BinaryIO | None = None,
+        *,
+        tables: bool = True,
+    ) -> PreparedDocument:
+        """Extract, chunk and embed a PDF without touching session state.
+
+        Safe to call from worker threads with tables=False; pass the result
+        to prepare_tables() and then index_document() on the script thread.
+
+        Args:
+            doc_id: Document identifier.
+            filename: Name of the PDF file.
+            source_uri: S3 URI of the source document.
+            file_obj: Optional seekable file object with the PDF contents.
+            tables: Whether to extract tables with camelot as well.
+
+        Returns:
+            The prepared document.
+        """
+        if file_obj is not None:
+            file_stream = file_obj
+        else:
+            file_stream = self._fetch_cos_stream(source_uri)
 
         # Extract metadata (title, author) - need to read file first
         file_stream.seek(0)
         metadata = extract_metadata(file_stream)
+        prepared = PreparedDocument(doc_id, source_uri, metadata)
 
-        # Reset stream for table extraction
-        file_stream.seek(0)
-        # Extract tables for TableRAG using camelot
-        dataframes = extract_tables_camelot(file_stream, doc_id)
-        if dataframes:
-            store_tables_in_session(dataframes, doc_id)
-            logger.info(f"Extracted {len(dataframes)} tables from {filename}")
+        if tables:
+            self.prepare_tables(prepared, filename, file_stream)
 
         # Reset stream for text extraction
         file_stream.seek(0)
@@ -244,14 +297,14 @@ class IngestionPipeline:
         )
 
         if not chunks:
-            return 0
+            return prepared
 
         # Embed with automatic retry and re-chunking
         embeddings, safe_chunks = self._embed_with_retry(chunks)
 
         if not embeddings or not safe_chunks:
             logger.warning("No embeddings generated after retries")
-            return 0
+            return prepared
 
         if len(embeddings) != len(safe_chunks):
             # This shouldn't happen, but log if it does
@@ -262,10 +315,53 @@ class IngestionPipeline:
             min_len = min(len(embeddings), len(safe_chunks))
             embeddings = embeddings[:min_len]
             safe_chunks = safe_chunks[:min_len]
+        prepared.chunks = safe_chunks
+        prepared.embeddings = embeddings
+        return prepared
+
+    def prepare_tables(
+        self, prepared: PreparedDocument, filename: str, file_obj: BinaryIO
+    ) -> None:
+        """Extract a PDF's tables for TableRAG into prepared.dataframes.
+
+        camelot is not thread-safe (the lattice parser renders pages through
+        Ghostscript by default), so callers that prepare documents
+        concurrently run this from a single thread.
+
+        Args:
+            prepared: Result of prepare_pdf(..., tables=False).
+            filename: Name of the PDF file.
+            file_obj: Seekable file object with the PDF contents.
+        """
+        file_obj.seek(0)
+        prepared.dataframes = extract_tables_camelot(file_obj, prepared.doc_id) or []
+        if prepared.dataframes:
+            logger.info(f"Extracted {len(prepared.dataframes)} tables from {filename}")
+
+    def index_document(
+        self, prepared: PreparedDocument
+    ) -> tuple[int, dict[str, str | None]]:
+        """Store a prepared document's tables and chunks in session state.
+
+        Args:
+            prepared: Result of prepare_pdf().
+
+        Returns:
+            Tuple of (upserted_count, metadata_dict) where metadata_dict
+            contains title and author if available.
+        """
+        doc_id = prepared.doc_id
+        source_uri = prepared.source_uri
+        if prepared.dataframes:
+            store_tables_in_session(prepared.dataframes, doc_id)
+
+        if not prepared.chunks:
+            return 0
+
         records: list[tuple[str, str, int, int, str, list[float], str]] = []
         metadata_list = []
-        for idx, (text, emb) in enumerate(zip(safe_chunks, embeddings)):
-            rec_id = str(uuid.uuid4())[:32]
+        for idx, (text, emb) in enumerate(zip(prepared.chunks, prepared.embeddings)):
+            rec_id = secrets.token_hex(16)
             records.append((rec_id, doc_id, 0, idx, text, emb, source_uri))
             # Prepare metadata for BM25
             metadata_list.append(
@@ -282,7 +378,7 @@ class IngestionPipeline:
         upserted = self.vs.upsert_chunks(records)
         # Also index in BM25 (rebuilds from session state metadata)
         self.bm25.add_chunks(metadata_list)
-        return upserted, metadata
+        return upserted, prepared.metadata
 
     def _fetch_cos_stream(self, s3_url: str) -> io.BytesIO:
         """Fetch a file from Cloud Object Storage as a stream.
@@ -435,6 +531,7 @@ class QueryPipeline:
         question: str,
         allowed_doc_ids: list[str] | None = None,
         use_orchestrator: bool | None = None,
+        stream: bool = True,
     ) -> tuple[str, list[str]]:
         """Answer question with optional filtering by document IDs (session-based).
 
@@ -445,10 +542,19 @@ class QueryPipeline:
             allowed_doc_ids: Optional list of allowed document IDs.
             use_orchestrator: Optional override flag. If None, auto-detect.
                 If False, skip orchestrator.
+            stream: Whether to send generated chunks to the UI token callback.
+                Disabled for orchestrator sub-questions.
 
         Returns:
             Tuple of (answer, sources).
         """
+        # Stream raw tokens to the UI if it registered a callback
+        token_callback = (
+            st.session_state.get("_token_callback")
+            if stream and st is not None
+            else None
+        )
+
         # Detect if query is complex (unless explicitly disabled)
         if use_orchestrator is None:
             use_iterative = self._is_complex_query(question)
@@ -472,6 +578,7 @@ class QueryPipeline:
                     allowed_doc_ids=allowed_doc_ids,
                     show_trajectory=show_trajectory,
                     status_callback=status_callback,
+                    token_callback=token_callback,
                 )
                 answer, sources, trajectory = (
                     result if len(result) == 3 else (result[0], result[1], None)
@@ -488,15 +595,25 @@ class QueryPipeline:
                 logger.warning(
                     f"Orchestrator failed: {e}, falling back to standard RAG"
                 )
-                # Fall through to standard RAG
+                # Fall through to standard RAG. The orchestrator may already
+                # have streamed part of its synthesis, so start a fresh
+                # stream rather than appending to it
+                if token_callback is not None:
+                    token_reset = st.session_state.get("_token_reset")
+                    if token_reset is not None:
+                        token_reset()
+                        token_callback = st.session_state.get("_token_callback")
 
         # Standard RAG pipeline for simple queries
         # Step 1: Hybrid Search - Run both semantic (FAISS) and keyword (BM25) search
-        q_emb = self.embed.embed_query(question)
-        semantic_hits = self.vs.search(q_emb, top_k=25, allowed_doc_ids=allowed_doc_ids)
+        # The query embedding is a network round-trip that touches no session
+        # state, so it runs in a worker thread while BM25 scores on this thread
+        q_emb_future = _EMBED_POOL.submit(self.embed.embed_query, question)
         keyword_hits = self.bm25.search(
             question, top_k=25, allowed_doc_ids=allowed_doc_ids
         )
+        q_emb = q_emb_future.result()
+        semantic_hits = self.vs.search(q_emb, top_k=25, allowed_doc_ids=allowed_doc_ids)
 
         # Step 2: Combine results using Reciprocal Rank Fusion (RRF)
         fused_hits = self._reciprocal_rank_fusion(semantic_hits, keyword_hits)
@@ -530,7 +647,10 @@ class QueryPipeline:
             effective_contexts = contexts
 
         answer = self.gen.generate(
-            question, effective_contexts, temperature=self.settings.temperature
+            question,
+            effective_contexts,
+            temperature=self.settings.temperature,
+            on_token=token_callback,
         )
 
         # Step 7: Verify answer against source chunks (for simple queries)
@@ -9,6 +9,12 @@ from app.rag.generator import GeneratorClient
 
 logger = logging.getLogger(__name__)
 
+# Sentence boundaries (period, semicolon, newline) used to split answers into claims
+_CLAIM_SPLIT_RE = re.compile(r"[.;]\s+|\n+")
+_QUANTITATIVE_RE = re.compile(
+    r"\d+[.%]|\bp\s*[<>=]\s*\d|confidence|interval|sample\s*size", re.IGNORECASE
+)
+
 
 class AnswerVerifier:
     """
@@ -36,7 +42,7 @@ class AnswerVerifier:
             List of individual claims (sentences/phrases)
         """
         # Split by sentence boundaries (period, semicolon, newline)
-        sentences = re.split(r"[.;]\s+|\n+", answer)
+        sentences = _CLAIM_SPLIT_RE.split(answer)
 
         # Filter and clean claims
         claims = []
@@ -66,13 +72,7 @@ class AnswerVerifier:
                 continue
 
             # Prioritize claims with quantitative data (numbers, percentages, p-values, etc.)
-            has_quantitative = bool(
-                re.search(
-                    r"\d+[.%]|\bp\s*[<>=]\s*\d|confidence|interval|sample\s*size",
-                    sentence,
-                    re.IGNORECASE,
-                )
-            )
+            has_quantitative = bool(_QUANTITATIVE_RE.search(sentence))
 
             # Include claims with specific findings, outcomes, or results
             has_finding = any(
@@ -0,0 +1,59 @@
+"""Tests for the throttled streaming callback in app.main."""
+
+from app.main import _STREAM_FLUSH_INTERVAL, _stream_writer
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_fast_burst_is_capped_by_flush_interval():
+    clock = FakeClock()
+    renders: list[str] = []
+    write = _stream_writer(renders.append, clock=clock)
+
+    # 1000 ten-character tokens arriving 1 ms apart: one second of output
+    for _ in range(1000):
+        clock.now += 0.001
+        write("abcdefghij")
+
+    # At most one redraw per interval, i.e. ~20 for one second of streaming
+    assert len(renders) <= int(1.0 / _STREAM_FLUSH_INTERVAL)
+    assert len(renders) >= int(1.0 / _STREAM_FLUSH_INTERVAL) - 1
+
+
+def test_small_chunks_wait_for_minimum_characters():
+    clock = FakeClock()
+    renders: list[str] = []
+    write = _stream_writer(renders.append, clock=clock)
+
+    clock.now += 1.0
+    write("a")
+    assert renders == []
+
+    write("bcdefgh")
+    assert renders == ["abcdefgh"]
+
+
+def test_chunks_are_escaped_and_first_chunk_hook_runs_once():
+    clock = FakeClock()
+    renders: list[str] = []
+    first_chunk_calls: list[None] = []
+    write = _stream_writer(
+        renders.append,
+        on_first_chunk=lambda: first_chunk_calls.append(None),
+        clock=clock,
+    )
+
+    clock.now += 1.0
+    write("<b>bold</b>\n")
+    write("more")
+
+    assert len(first_chunk_calls) == 1
+    assert renders == ["&lt;b&gt;bold&lt;/b&gt;&#10;"]